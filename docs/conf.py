@@ -196,3 +196,4 @@ nbsphinx_thumbnails = {
 def setup(app):
     # https://github.com/pradyunsg/furo/issues/49
     app.config.pygments_dark_style = "default"
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
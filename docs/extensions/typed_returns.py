@@ -26,3 +26,4 @@ def scanpy_parse_returns_section(self, section):
 
 def setup(app: Sphinx):
     NumpyDocstring._parse_returns_section = scanpy_parse_returns_section
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
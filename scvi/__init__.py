@@ -1,13 +1,25 @@
 """scvi-tools."""
 
 # Set default logging handler to avoid logging with logging.lastResort logger.
+import importlib
 import logging
 
 from ._constants import _CONSTANTS
 from ._settings import settings
 
-# this import needs to come after prior imports to prevent circular import
-from . import data, model, external
+# the subpackages pull in pytorch-lightning, pyro, etc., so they are only
+# imported on first attribute access (PEP 562)
+_LAZY_SUBMODULES = (
+    "data",
+    "dataloaders",
+    "distributions",
+    "external",
+    "model",
+    "module",
+    "nn",
+    "train",
+    "utils",
+)
 
 # https://github.com/python-poetry/poetry/pull/2366#issuecomment-652418094
 # https://github.com/python-poetry/poetry/issues/144#issuecomment-623927302
@@ -21,4 +33,14 @@ __version__ = importlib_metadata.version(package_name)
 settings.verbosity = logging.INFO
 test_var = "test"
 
-__all__ = ["settings", "_CONSTANTS", "data", "model", "external"]
+__all__ = ["settings", "_CONSTANTS", *_LAZY_SUBMODULES]
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_SUBMODULES))
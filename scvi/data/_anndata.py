@@ -551,7 +551,7 @@ def _transfer_protein_expression(_scvi_dict, adata_target, batch_key):
             )
 
             # check if it's actually needed
-            if np.sum([~b[1] for b in batch_mask.items()]) > 0:
+            if not all(mask.all() for mask in batch_mask.values()):
                 logger.info("Found batches with missing protein expression")
                 adata_target.uns["_scvi"]["totalvi_batch_mask"] = batch_mask
     else:
@@ -785,7 +785,7 @@ def _setup_protein_expression(
     )
 
     # check if it's actually needed
-    if np.sum([~b[1] for b in batch_mask.items()]) > 0:
+    if not all(mask.all() for mask in batch_mask.values()):
         logger.info("Found batches with missing protein expression")
         adata.uns["_scvi"]["totalvi_batch_mask"] = batch_mask
     return protein_expression_obsm_key
@@ -68,7 +68,13 @@ def _load_brainlarge_file(
         var = gene_var_sample_matrix.multiply(gene_var_sample_matrix).mean(
             axis=1
         ) - np.multiply(mean, mean)
-        subset_genes = np.squeeze(np.asarray(var)).argsort()[-n_genes_to_keep:][::-1]
+        var = np.asarray(var).ravel()
+        # only the top n_genes_to_keep genes need to be ordered
+        if n_genes_to_keep < len(var):
+            subset_genes = np.argpartition(-var, n_genes_to_keep - 1)[:n_genes_to_keep]
+        else:
+            subset_genes = np.arange(len(var))
+        subset_genes = subset_genes[np.argsort(-var[subset_genes], kind="stable")]
         del gene_var_sample_matrix, mean, var
 
         n_iters = int(n_cells_to_keep / loading_batch_size) + (
@@ -106,19 +112,15 @@ def _load_brainlarge_file(
             )
     logger.info("%d cells subsampled" % matrix.shape[0])
     logger.info("%d genes subsampled" % matrix.shape[1])
+    matrix = matrix.tocsr()
+    matrix.eliminate_zeros()
     adata = anndata.AnnData(matrix)
     adata.obs["labels"] = np.zeros(matrix.shape[0])
     adata.obs["batch"] = np.zeros(matrix.shape[0])
 
-    counts = adata.X.sum(1)
-    if sp_sparse.issparse(counts):
-        counts = counts.A1
-
-    gene_num = (adata.X > 0).sum(1)
-    if sp_sparse.issparse(gene_num):
-        gene_num = gene_num.A1
-
-    adata = adata[counts > 1]
-    adata = adata[gene_num > 1]
+    counts = np.asarray(matrix.sum(axis=1)).ravel()
+    # number of expressed genes per cell, read off indptr without a pass over data
+    gene_num = matrix.getnnz(axis=1)
+    adata = adata[(counts > 1) & (gene_num > 1)]
 
     return adata.copy()
@@ -1,10 +1,13 @@
 import csv
+import hashlib
 import logging
 import os
+from typing import Optional, Tuple
 
 import anndata
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp_sparse
 
 from scvi.data._anndata import setup_anndata
 from scvi.data._built_in_data._download import _download
@@ -28,22 +31,19 @@ def _load_cortex(
 
 def _load_cortex_txt(path_to_file: str) -> anndata.AnnData:
     logger.info("Loading Cortex data from {}".format(path_to_file))
-    rows = []
-    gene_names = []
-    with open(path_to_file, "r") as csvfile:
-        data_reader = csv.reader(csvfile, delimiter="\t")
-        for i, row in enumerate(data_reader):
-            if i == 1:
-                precise_clusters = np.asarray(row, dtype=str)[2:]
-            if i == 8:
-                clusters = np.asarray(row, dtype=str)[2:]
-            if i >= 11:
-                rows.append(row[1:])
-                gene_names.append(row[0])
+    cache_path = os.path.splitext(path_to_file)[0] + ".cache.npz"
+    key = _cortex_cache_key(path_to_file)
+    cached = _read_cortex_cache(cache_path, key)
+    if cached is not None:
+        logger.info("Using cached Cortex data from {}".format(cache_path))
+        data, gene_names, precise_clusters, clusters = cached
+    else:
+        data, gene_names, precise_clusters, clusters = _parse_cortex_txt(path_to_file)
+        _write_cortex_cache(
+            cache_path, key, data, gene_names, precise_clusters, clusters
+        )
     cell_types, labels = np.unique(clusters, return_inverse=True)
     _, precise_labels = np.unique(precise_clusters, return_inverse=True)
-    data = np.asarray(rows, dtype=np.int).T[1:]
-    gene_names = np.asarray(gene_names, dtype=np.str)
     gene_indices = []
 
     extra_gene_indices = []
@@ -53,10 +53,117 @@ def _load_cortex_txt(path_to_file: str) -> anndata.AnnData:
 
     data = data[:, gene_indices]
     gene_names = gene_names[gene_indices]
-    data_df = pd.DataFrame(data, columns=gene_names)
-    adata = anndata.AnnData(X=data_df)
+    adata = anndata.AnnData(X=data, var=pd.DataFrame(index=gene_names))
     adata.obs["labels"] = labels
     adata.obs["precise_labels"] = precise_clusters
     adata.obs["cell_type"] = clusters
     logger.info("Finished loading Cortex data")
     return adata
+
+
+def _parse_cortex_txt(
+    path_to_file: str,
+) -> Tuple[sp_sparse.csr_matrix, np.ndarray, np.ndarray, np.ndarray]:
+    """Parses the raw cortex file into counts, gene names and cell clusters."""
+    # only the cell metadata header is parsed in Python
+    with open(path_to_file, "r") as csvfile:
+        data_reader = csv.reader(csvfile, delimiter="\t")
+        for i, row in enumerate(data_reader):
+            if i == 1:
+                precise_clusters = row[2:]
+            if i == 8:
+                clusters = row[2:]
+                break
+    precise_clusters = np.asarray(precise_clusters, dtype=str)
+    clusters = np.asarray(clusters, dtype=str)
+    # the expression block (genes x cells) is parsed by the pandas C engine
+    # straight into int32 columns, skipping the unused second column
+    cell_columns = range(2, len(precise_clusters) + 2)
+    expression = pd.read_csv(
+        path_to_file,
+        sep="\t",
+        header=None,
+        skiprows=11,
+        index_col=0,
+        usecols=[0, *cell_columns],
+        dtype={0: str, **{j: np.int32 for j in cell_columns}},
+        keep_default_na=False,
+        engine="c",
+    )
+    data = sp_sparse.csr_matrix(expression.to_numpy().T, dtype=np.float32)
+    gene_names = expression.index.to_numpy(dtype=str)
+    return data, gene_names, precise_clusters, clusters
+
+
+def _cortex_cache_key(path_to_file: str, block_size: int = 1 << 20) -> str:
+    """Cheap content key of the raw file: its size and a hash of both ends."""
+    size = os.path.getsize(path_to_file)
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path_to_file, "rb") as f:
+        h.update(f.read(block_size))
+        if size > block_size:
+            f.seek(max(size - block_size, block_size))
+            h.update(f.read(block_size))
+    return h.hexdigest()
+
+
+def _read_cortex_cache(
+    cache_path: str, key: str
+) -> Optional[Tuple[sp_sparse.csr_matrix, np.ndarray, np.ndarray, np.ndarray]]:
+    """Returns the cached parse of the cortex file, if it matches ``key``."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            if str(cache["key"]) != key:
+                return None
+            data = sp_sparse.csr_matrix(
+                (cache["data"], cache["indices"], cache["indptr"]),
+                shape=tuple(cache["shape"]),
+            )
+            return (
+                data,
+                cache["gene_names"],
+                cache["precise_clusters"],
+                cache["clusters"],
+            )
+    except (OSError, KeyError, ValueError):
+        logger.info("Ignoring unreadable Cortex cache {}".format(cache_path))
+        return None
+
+
+def _write_cortex_cache(
+    cache_path: str,
+    key: str,
+    data: sp_sparse.csr_matrix,
+    gene_names: np.ndarray,
+    precise_clusters: np.ndarray,
+    clusters: np.ndarray,
+):
+    """
+    Saves the parsed cortex file to ``cache_path``, keyed by ``key``.
+
+    The cache is written to a temporary file that is then moved into place, so an
+    interrupted run never leaves a truncated cache. If the location is not writable,
+    caching is skipped.
+    """
+    tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                key=key,
+                data=data.data,
+                indices=data.indices,
+                indptr=data.indptr,
+                shape=data.shape,
+                gene_names=gene_names,
+                precise_clusters=precise_clusters,
+                clusters=clusters,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        logger.info("Could not write Cortex cache {}".format(cache_path))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
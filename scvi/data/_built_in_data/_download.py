@@ -4,7 +4,7 @@ import urllib
 
 import numpy as np
 
-from scvi.utils import track
+from scvi.utils._track import track
 
 logger = logging.getLogger(__name__)
 
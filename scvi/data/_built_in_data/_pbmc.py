@@ -84,15 +84,14 @@ def _load_pbmc_dataset(
 
     dict_barcodes = dict(zip(barcodes, np.arange(len(barcodes))))
     subset_cells = []
-    barcodes_metadata = pbmc_metadata["barcodes"].index.values.ravel().astype(np.str)
+    barcodes_metadata = pbmc_metadata["barcodes"].index.to_numpy(dtype=str)
     for barcode in barcodes_metadata:
         if (
             barcode in dict_barcodes
         ):  # barcodes with end -11 filtered on 10X website (49 cells)
             subset_cells += [dict_barcodes[barcode]]
-    adata = adata[np.asarray(subset_cells), :].copy()
     idx_metadata = np.asarray(
-        [not barcode.endswith("11") for barcode in barcodes_metadata], dtype=np.bool
+        [not barcode.endswith("11") for barcode in barcodes_metadata], dtype=bool
     )
     genes_to_keep = list(
         de_metadata["ENSG"].values
@@ -103,7 +102,8 @@ def _load_pbmc_dataset(
     for gene in difference:
         genes_to_keep.remove(gene)
 
-    adata = adata[:, genes_to_keep].copy()
+    # subset cells and genes together so the count matrix is copied only once
+    adata = adata[np.asarray(subset_cells), genes_to_keep].copy()
     design = pbmc_metadata["design"][idx_metadata]
     raw_qc = pbmc_metadata["raw_qc"][idx_metadata]
     normalized_qc = pbmc_metadata["normalized_qc"][idx_metadata]
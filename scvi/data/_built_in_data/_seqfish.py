@@ -90,10 +90,9 @@ def _load_seqfish_data(path_to_file: str) -> anndata.AnnData:
     counts = pd.read_excel(
         path_to_file, sheet_name="Hippocampus Counts", engine="openpyxl"
     )
-    data = (
-        counts.values[:, 1:].astype(int).T
-    )  # transpose because counts is genes X cells
-    gene_names = counts.values[:, 0].astype(str)
+    # transpose because counts is genes X cells, into a single cell-major copy
+    data = np.ascontiguousarray(counts.iloc[:, 1:].to_numpy(dtype=int).T)
+    gene_names = counts.iloc[:, 0].to_numpy(dtype=str)
     adata = anndata.AnnData(pd.DataFrame(data=data, columns=gene_names))
     logger.info("Finished loading seqfish dataset")
     return adata
@@ -6,9 +6,9 @@ import numpy as np
 import pandas as pd
 import torch
 
-from scvi.utils import track
+from scvi.utils._track import track
 
-from ._utils import _check_nonnegative_integers
+from ._utils import _check_nonnegative_integers, _get_batch_codes
 
 logger = logging.getLogger(__name__)
 
@@ -99,10 +99,12 @@ def poisson_gene_selection(
     prob_zero_enrichments = []
     obs_frac_zeross = []
     exp_frac_zeross = []
-    for b in np.unique(batch_info):
+    # index the count matrix directly rather than building an AnnData view per batch
+    counts = data
+    batch_names, batch_codes = _get_batch_codes(batch_info)
+    for b in range(len(batch_names)):
 
-        ad = adata[batch_info == b]
-        data = ad.layers[layer] if layer is not None else ad.X
+        data = counts[batch_codes == b]
 
         # Calculate empirical statistics.
         scaled_means = torch.from_numpy(np.asarray(data.sum(0) / data.sum()).ravel())
@@ -1,6 +1,6 @@
 import logging
 import warnings
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 import anndata
 import h5py
@@ -8,27 +8,151 @@ import numpy as np
 import pandas as pd
 import scipy.sparse as sp_sparse
 from anndata._core.sparse_dataset import SparseDataset
-from numba import boolean, float32, float64, int32, int64, vectorize
+from numba import (
+    boolean,
+    float32,
+    float64,
+    get_num_threads,
+    int32,
+    int64,
+    njit,
+    prange,
+    vectorize,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _get_count_matrix(adata: anndata.AnnData, layer: Optional[str] = None):
+    """Returns the in-memory count matrix of ``adata.X`` or ``adata.layers[layer]``."""
+    if layer is not None:
+        if layer not in adata.layers.keys():
+            raise ValueError("layer not a valid key for adata.layers")
+        data = adata.layers[layer]
+    else:
+        data = adata.X
+    # for backed anndata
+    if isinstance(data, h5py.Dataset) or isinstance(data, SparseDataset):
+        data = data[:]
+    return data
+
+
+def _warn_empty_cells():
+    warnings.warn(
+        "This dataset has some empty cells, this might fail inference."
+        "Data should be filtered with `scanpy.pp.filter_cells()`"
+    )
+
+
+def _compute_log_library_size(
+    data: Union[sp_sparse.spmatrix, np.ndarray]
+) -> np.ndarray:
+    """Per-cell log library size, with empty cells set to 0."""
+    sum_counts = np.asarray(data.sum(axis=1), dtype=np.float64).ravel()
+    nonempty = sum_counts > 0
+    if not nonempty.all():
+        _warn_empty_cells()
+    return np.log(sum_counts, out=np.zeros_like(sum_counts), where=nonempty)
+
+
 def _compute_library_size(
     data: Union[sp_sparse.spmatrix, np.ndarray]
 ) -> Tuple[np.ndarray, np.ndarray]:
-    sum_counts = data.sum(axis=1)
-    masked_log_sum = np.ma.log(sum_counts)
-    if np.ma.is_masked(masked_log_sum):
-        warnings.warn(
-            "This dataset has some empty cells, this might fail inference."
-            "Data should be filtered with `scanpy.pp.filter_cells()`"
-        )
-    log_counts = masked_log_sum.filled(0)
-    local_mean = (np.mean(log_counts).reshape(-1, 1)).astype(np.float32)
-    local_var = (np.var(log_counts).reshape(-1, 1)).astype(np.float32)
+    # a single batch, so CSR input goes through the fused numba kernel
+    batch_codes = np.zeros(data.shape[0], dtype=np.intp)
+    means, variances = _compute_library_size_moments(data, batch_codes)
+    local_mean = means.astype(np.float32).reshape(-1, 1)
+    local_var = variances.astype(np.float32).reshape(-1, 1)
     return local_mean, local_var
 
 
+@njit(parallel=True, cache=True)
+def _library_size_sums_csr(indptr, data, batch_codes, n_batches, n_chunks):
+    """
+    Per-batch sums of the log library size and its square over a CSR matrix.
+
+    Rows are split in ``n_chunks`` contiguous blocks with their own
+    accumulators, so the parallel loop has no write conflicts.
+    """
+    n_rows = indptr.shape[0] - 1
+    chunk_size = (n_rows + n_chunks - 1) // n_chunks
+    s1 = np.zeros((n_chunks, n_batches))
+    s2 = np.zeros((n_chunks, n_batches))
+    n_cells = np.zeros((n_chunks, n_batches), dtype=np.int64)
+    n_empty = np.zeros(n_chunks, dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(c * chunk_size, min((c + 1) * chunk_size, n_rows)):
+            total = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                total += data[k]
+            b = batch_codes[i]
+            n_cells[c, b] += 1
+            if total > 0:
+                log_total = np.log(total)
+                s1[c, b] += log_total
+                s2[c, b] += log_total * log_total
+            else:
+                n_empty[c] += 1
+    return s1.sum(axis=0), s2.sum(axis=0), n_cells.sum(axis=0), n_empty.sum()
+
+
+def _compute_library_size_moments(
+    data: Union[sp_sparse.spmatrix, np.ndarray], batch_codes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and variance of the log library size for each batch code."""
+    n_batches = batch_codes.max() + 1 if batch_codes.size else 0
+    if sp_sparse.isspmatrix_csr(data):
+        s1, s2, n_cells, n_empty = _library_size_sums_csr(
+            data.indptr, data.data, batch_codes, n_batches, get_num_threads()
+        )
+        if n_empty > 0:
+            _warn_empty_cells()
+    else:
+        log_counts = _compute_log_library_size(data)
+        n_cells = np.bincount(batch_codes, minlength=n_batches)
+        s1 = np.bincount(batch_codes, weights=log_counts, minlength=n_batches)
+        s2 = np.bincount(
+            batch_codes, weights=log_counts * log_counts, minlength=n_batches
+        )
+    means = s1 / n_cells
+    variances = np.maximum(s2 / n_cells - means ** 2, 0)
+    return means, variances
+
+
+def _get_batch_codes(
+    batches, registered: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the unique batches and the index of each cell's batch among them.
+
+    Equivalent to ``np.unique(batches, return_inverse=True)``, but categoricals and
+    `registered` batch columns (the ``_scvi_batch`` codes written by
+    :func:`~scvi.data.setup_anndata`) already hold dense codes, so these are counted
+    in linear time instead of sorted. Other integer columns can hold arbitrarily
+    large ids and always go through ``np.unique``.
+    """
+    batches = batches.values if isinstance(batches, pd.Series) else batches
+    if isinstance(batches, pd.Categorical):
+        names = np.asarray(batches.categories)
+        codes = np.asarray(batches.codes)
+    elif registered:
+        batches = np.asarray(batches).ravel()
+        names, codes = None, batches
+    else:
+        return np.unique(np.asarray(batches), return_inverse=True)
+    if codes.size == 0 or not np.issubdtype(codes.dtype, np.integer) or codes.min() < 0:
+        return np.unique(np.asarray(batches), return_inverse=True)
+    counts = np.bincount(codes)
+    if names is None:
+        names = np.arange(len(counts), dtype=codes.dtype)
+    present = counts > 0
+    if not present.all():
+        # drop batches without cells, as np.unique would
+        codes = (np.cumsum(present) - 1)[codes]
+        names = names[np.flatnonzero(present)]
+    return names, codes.astype(np.intp, copy=False)
+
+
 def _compute_library_size_batch(
     adata,
     batch_key: str,
@@ -63,18 +187,13 @@ def _compute_library_size_batch(
     """
     if batch_key not in adata.obs_keys():
         raise ValueError("batch_key not valid key in obs dataframe")
-    local_means = np.zeros((adata.shape[0], 1))
-    local_vars = np.zeros((adata.shape[0], 1))
-    batch_indices = adata.obs[batch_key]
-    for i_batch in np.unique(batch_indices):
-        idx_batch = np.squeeze(batch_indices == i_batch)
-        if layer is not None:
-            if layer not in adata.layers.keys():
-                raise ValueError("layer not a valid key for adata.layers")
-            data = adata[idx_batch].layers[layer]
-        else:
-            data = adata[idx_batch].X
-        (local_means[idx_batch], local_vars[idx_batch]) = _compute_library_size(data)
+    data = _get_count_matrix(adata, layer)
+    _, batch_codes = _get_batch_codes(
+        adata.obs[batch_key], registered=batch_key == "_scvi_batch"
+    )
+    batch_means, batch_vars = _compute_library_size_moments(data, batch_codes)
+    local_means = batch_means.astype(np.float32)[batch_codes].reshape(-1, 1)
+    local_vars = batch_vars.astype(np.float32)[batch_codes].reshape(-1, 1)
     if local_l_mean_key is None:
         local_l_mean_key = "_scvi_local_l_mean"
     if local_l_var_key is None:
@@ -104,14 +223,21 @@ def _check_nonnegative_integers(
     elif issubclass(type(data), sp_sparse.spmatrix):
         data = data.data
     elif isinstance(data, pd.DataFrame):
-        data = data.to_numpy()
+        # a view for homogeneous frames, only mixed dtypes are copied
+        data = data.to_numpy(copy=False)
     else:
         raise TypeError("data type not understood")
 
-    n = len(data)
-    inds = np.random.permutation(n)[:20]
+    n = data.size
+    if n == 0:
+        return True
+    # sample with replacement, avoiding a permutation over all n entries; a
+    # local generator leaves the global numpy random state untouched
+    inds = np.random.default_rng(0).integers(n, size=min(n, 20))
     check = data.flat[inds]
-    return ~np.any(_is_not_count(check))
+    if np.issubdtype(check.dtype, np.integer):
+        return bool((check >= 0).all())
+    return not np.any(_is_not_count(check))
 
 
 @vectorize(
@@ -139,12 +265,13 @@ def _get_batch_mask_protein_data(
     """
     pro_exp = adata.obsm[protein_expression_obsm_key]
     pro_exp = pro_exp.to_numpy() if isinstance(pro_exp, pd.DataFrame) else pro_exp
-    batches = adata.obs[batch_key].values
-    batch_mask = {}
-    for b in np.unique(batches):
-        b_inds = np.where(batches.ravel() == b)[0]
-        batch_sum = pro_exp[b_inds, :].sum(axis=0)
-        all_zero = batch_sum == 0
-        batch_mask[b] = ~all_zero
+    batch_names, batch_codes = _get_batch_codes(
+        adata.obs[batch_key], registered=batch_key == "_scvi_batch"
+    )
+    # sort cells by batch once, then sum each contiguous batch block
+    order = np.argsort(batch_codes, kind="stable")
+    batch_starts = np.searchsorted(batch_codes[order], np.arange(len(batch_names)))
+    batch_sums = np.add.reduceat(np.asarray(pro_exp)[order], batch_starts, axis=0)
+    batch_mask = {b: batch_sum != 0 for b, batch_sum in zip(batch_names, batch_sums)}
 
     return batch_mask
@@ -10,7 +10,6 @@ from torch.utils.data import DataLoader, Dataset
 from scvi import _CONSTANTS, settings
 from scvi.dataloaders._ann_dataloader import AnnDataLoader, BatchSampler
 from scvi.dataloaders._semi_dataloader import SemiSupervisedDataLoader
-from scvi.model._utils import parse_use_gpu_arg
 
 
 def validate_data_split(
@@ -107,6 +106,9 @@ class DataSplitter(pl.LightningDataModule):
         self.train_idx = permutation[n_val : (n_val + n_train)]
         self.test_idx = permutation[(n_val + n_train) :]
 
+        # imported here as scvi.model imports this module
+        from scvi.model._utils import parse_use_gpu_arg
+
         gpus, self.device = parse_use_gpu_arg(self.use_gpu, return_device=True)
         self.pin_memory = (
             True if (settings.dl_pin_memory_gpu_training and gpus != 0) else False
@@ -265,6 +267,8 @@ class SemiSupervisedDataSplitter(pl.LightningDataModule):
         self.val_idx = indices_val.astype(int)
         self.test_idx = indices_test.astype(int)
 
+        from scvi.model._utils import parse_use_gpu_arg
+
         gpus = parse_use_gpu_arg(self.use_gpu, return_device=False)
         self.pin_memory = (
             True if (settings.dl_pin_memory_gpu_training and gpus != 0) else False
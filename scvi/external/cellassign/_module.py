@@ -188,11 +188,8 @@ class CellAssignModule(BaseModuleClass):
         x_log_prob_raw = nb_pdf.log_prob(x_)  # (n, g, c)
         theta_log = theta_log.expand(n_cells, self.n_labels)
         p_x_c = torch.sum(x_log_prob_raw, 1) + theta_log  # (n, c)
-        normalizer_over_c = torch.logsumexp(p_x_c, 1)
-        normalizer_over_c = normalizer_over_c.unsqueeze(-1).expand(
-            n_cells, self.n_labels
-        )
-        gamma = torch.exp(p_x_c - normalizer_over_c)  # (n, c)
+        # normalized over c in a single fused kernel
+        gamma = F.softmax(p_x_c, dim=1)  # (n, c)
 
         return dict(
             mu=mu_ngc,
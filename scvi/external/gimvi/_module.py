@@ -11,6 +11,7 @@ from torch.nn import ModuleList
 
 from scvi import _CONSTANTS
 from scvi.distributions import NegativeBinomial, ZeroInflatedNegativeBinomial
+from scvi.module._utils import kl_standard_normal
 from scvi.module.base import BaseModuleClass, LossRecorder, auto_move_data
 from scvi.nn import Encoder, MultiDecoder, MultiEncoder, one_hot
 
@@ -352,7 +353,7 @@ class JVAE(BaseModuleClass):
     def inference(self, x: torch.Tensor, mode: Optional[int] = None) -> dict:
         x_ = x
         if self.log_variational:
-            x_ = torch.log(1 + x_)
+            x_ = torch.log1p(x_)
 
         qz_m, qz_v, z = self.z_encoder(x_, mode)
         ql_m, ql_v, library = None, None, None
@@ -455,11 +456,7 @@ class JVAE(BaseModuleClass):
         )
 
         # KL Divergence
-        mean = torch.zeros_like(qz_m)
-        scale = torch.ones_like(qz_v)
-        kl_divergence_z = kl(Normal(qz_m, torch.sqrt(qz_v)), Normal(mean, scale)).sum(
-            dim=1
-        )
+        kl_divergence_z = kl_standard_normal(qz_m, qz_v)
 
         if self.model_library_bools[mode]:
             kl_divergence_l = kl(
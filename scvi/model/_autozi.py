@@ -5,12 +5,13 @@ import numpy as np
 import torch
 from anndata import AnnData
 from torch import logsumexp
-from torch.distributions import Beta, Normal
+from torch.distributions import Beta
 
 from scvi import _CONSTANTS
 from scvi._compat import Literal
 from scvi.model.base import UnsupervisedTrainingMixin
 from scvi.module import AutoZIVAE
+from scvi.module._utils import normal_log_prob
 
 from .base import BaseModelClass, VAEMixin
 
@@ -149,6 +150,7 @@ class AUTOZI(VAEMixin, UnsupervisedTrainingMixin, BaseModelClass):
         indices: Optional[Sequence[int]] = None,
         n_mc_samples: int = 1000,
         batch_size: Optional[int] = None,
+        n_mc_samples_per_pass: int = 25,
     ) -> float:
         """
         Return the marginal LL for the data.
@@ -167,6 +169,9 @@ class AUTOZI(VAEMixin, UnsupervisedTrainingMixin, BaseModelClass):
             Number of Monte Carlo samples to use for marginal LL estimation.
         batch_size
             Minibatch size for data loading into model. Defaults to `scvi.settings.batch_size`.
+        n_mc_samples_per_pass
+            Number of Monte Carlo samples drawn for each pass over the data. Every
+            minibatch is loaded once per pass.
         """
         adata = self._validate_anndata(adata)
         if indices is None:
@@ -177,76 +182,80 @@ class AUTOZI(VAEMixin, UnsupervisedTrainingMixin, BaseModelClass):
         )
 
         log_lkl = 0
-        to_sum = torch.zeros((n_mc_samples,))
+        # accumulated on the model device, read back once at the end
+        to_sum = torch.zeros((n_mc_samples,), device=self.device)
         alphas_betas = self.module.get_alphas_betas(as_numpy=False)
         alpha_prior = alphas_betas["alpha_prior"]
         alpha_posterior = alphas_betas["alpha_posterior"]
         beta_prior = alphas_betas["beta_prior"]
         beta_posterior = alphas_betas["beta_posterior"]
 
-        for i in range(n_mc_samples):
-            bernoulli_params = self.module.sample_from_beta_distribution(
-                alpha_posterior, beta_posterior
-            )
+        # the Monte Carlo samples are drawn in blocks, and every minibatch is
+        # loaded once per block rather than once per sample
+        for start in range(0, n_mc_samples, n_mc_samples_per_pass):
+            sample_ids = range(start, min(start + n_mc_samples_per_pass, n_mc_samples))
+            bernoulli_params_block = [
+                self.module.sample_from_beta_distribution(
+                    alpha_posterior, beta_posterior
+                )
+                for _ in sample_ids
+            ]
             for tensors in scdl:
+                # copied to the device once, not for every sample of the block
+                tensors = {k: t.to(self.device) for k, t in tensors.items()}
                 sample_batch = tensors[_CONSTANTS.X_KEY]
                 local_l_mean = tensors[_CONSTANTS.LOCAL_L_MEAN_KEY]
                 local_l_var = tensors[_CONSTANTS.LOCAL_L_VAR_KEY]
                 batch_index = tensors[_CONSTANTS.BATCH_KEY]
                 labels = tensors[_CONSTANTS.LABELS_KEY]
 
-                # Distribution parameters and sampled variables
-                inf_outputs, gen_outputs, losses = self.module.forward(tensors)
-
-                px_r = gen_outputs["px_r"]
-                px_rate = gen_outputs["px_rate"]
-                px_dropout = gen_outputs["px_dropout"]
-                qz_m = inf_outputs["qz_m"]
-                qz_v = inf_outputs["qz_v"]
-                z = inf_outputs["z"]
-                ql_m = inf_outputs["ql_m"]
-                ql_v = inf_outputs["ql_v"]
-                library = inf_outputs["library"]
-
-                # Reconstruction Loss
-                current_dev = px_rate.device
-                bernoulli_params_batch = self.module.reshape_bernoulli(
-                    bernoulli_params,
-                    batch_index.to(current_dev),
-                    labels.to(current_dev),
-                )
-                reconst_loss = self.module.get_reconstruction_loss(
-                    sample_batch.to(current_dev),
-                    px_rate,
-                    px_r,
-                    px_dropout,
-                    bernoulli_params_batch,
-                )
-
-                # Log-probabilities
-                p_l = (
-                    Normal(
-                        local_l_mean.to(current_dev), local_l_var.to(current_dev).sqrt()
+                for i, bernoulli_params in zip(sample_ids, bernoulli_params_block):
+                    # Distribution parameters and sampled variables
+                    inf_outputs, gen_outputs, losses = self.module.forward(tensors)
+
+                    px_r = gen_outputs["px_r"]
+                    px_rate = gen_outputs["px_rate"]
+                    px_dropout = gen_outputs["px_dropout"]
+                    qz_m = inf_outputs["qz_m"]
+                    qz_v = inf_outputs["qz_v"]
+                    z = inf_outputs["z"]
+                    ql_m = inf_outputs["ql_m"]
+                    ql_v = inf_outputs["ql_v"]
+                    library = inf_outputs["library"]
+
+                    # Reconstruction Loss
+                    bernoulli_params_batch = self.module.reshape_bernoulli(
+                        bernoulli_params, batch_index, labels
+                    )
+                    reconst_loss = self.module.get_reconstruction_loss(
+                        sample_batch,
+                        px_rate,
+                        px_r,
+                        px_dropout,
+                        bernoulli_params_batch,
                     )
-                    .log_prob(library)
-                    .sum(dim=-1)
-                )
-                p_z = (
-                    Normal(torch.zeros_like(qz_m), torch.ones_like(qz_v))
-                    .log_prob(z)
-                    .sum(dim=-1)
-                )
-                p_x_zld = -reconst_loss.to(p_z.device)
-                q_z_x = Normal(qz_m, qz_v.sqrt()).log_prob(z).sum(dim=-1)
-                q_l_x = Normal(ql_m, ql_v.sqrt()).log_prob(library).sum(dim=-1)
 
-                batch_log_lkl = torch.sum(p_x_zld + p_l + p_z - q_z_x - q_l_x, dim=0)
-                to_sum[i] += batch_log_lkl.cpu()
+                    # Log-probabilities
+                    p_l = normal_log_prob(library, local_l_mean, local_l_var)
+                    p_z = normal_log_prob(z)
+                    p_x_zld = -reconst_loss
+                    q_z_x = normal_log_prob(z, qz_m, qz_v)
+                    q_l_x = normal_log_prob(library, ql_m, ql_v)
 
-            p_d = Beta(alpha_prior, beta_prior).log_prob(bernoulli_params).sum()
-            q_d = Beta(alpha_posterior, beta_posterior).log_prob(bernoulli_params).sum()
+                    batch_log_lkl = torch.sum(
+                        p_x_zld + p_l + p_z - q_z_x - q_l_x, dim=0
+                    )
+                    to_sum[i] += batch_log_lkl
+
+            for i, bernoulli_params in zip(sample_ids, bernoulli_params_block):
+                p_d = Beta(alpha_prior, beta_prior).log_prob(bernoulli_params).sum()
+                q_d = (
+                    Beta(alpha_posterior, beta_posterior)
+                    .log_prob(bernoulli_params)
+                    .sum()
+                )
 
-            to_sum[i] += (p_d - q_d).cpu()
+                to_sum[i] += p_d - q_d
 
         log_lkl = logsumexp(to_sum, dim=-1).item() - np.log(n_mc_samples)
         n_samples = len(scdl.indices)
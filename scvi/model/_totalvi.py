@@ -398,12 +398,12 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
             gene_mask = slice(None)
         else:
             all_genes = _get_var_names_from_setup_anndata(adata)
-            gene_mask = [True if gene in gene_list else False for gene in all_genes]
+            gene_mask = np.isin(all_genes, gene_list)
         if protein_list is None:
             protein_mask = slice(None)
         else:
             all_proteins = self.scvi_setup_dict_["protein_names"]
-            protein_mask = [True if p in protein_list else False for p in all_proteins]
+            protein_mask = np.isin(all_proteins, protein_list)
         if indices is None:
             indices = np.arange(adata.n_obs)
 
@@ -423,13 +423,8 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
         scale_list_pro = []
 
         for tensors in post:
-            x = tensors[_CONSTANTS.X_KEY]
-            y = tensors[_CONSTANTS.PROTEIN_EXP_KEY]
-            px_scale = torch.zeros_like(x)
-            py_scale = torch.zeros_like(y)
-            if n_samples > 1:
-                px_scale = torch.stack(n_samples * [px_scale])
-                py_scale = torch.stack(n_samples * [py_scale])
+            px_scale = 0
+            py_scale = 0
             for b in transform_batch:
                 generative_kwargs = dict(transform_batch=b)
                 inference_kwargs = dict(n_samples=n_samples)
@@ -440,10 +435,11 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
                     compute_loss=False,
                 )
                 if library_size == "latent":
-                    px_scale += generative_outputs["px_"]["rate"].cpu()
+                    px = generative_outputs["px_"]["rate"]
                 else:
-                    px_scale += generative_outputs["px_"]["scale"].cpu()
-                px_scale = px_scale[..., gene_mask]
+                    px = generative_outputs["px_"]["scale"]
+                # subset the genes before copying to the host
+                px_scale += px[..., gene_mask].cpu()
 
                 py_ = generative_outputs["py_"]
                 # probability of background
@@ -464,10 +460,15 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
                 py_scale += protein_val
             px_scale /= len(transform_batch)
             py_scale /= len(transform_batch)
+            if return_mean is True and n_samples > 1:
+                # average the posterior samples of each minibatch right away
+                # instead of keeping all of them until the end
+                px_scale = torch.mean(px_scale, dim=0)
+                py_scale = torch.mean(py_scale, dim=0)
             scale_list_gene.append(px_scale)
             scale_list_pro.append(py_scale)
 
-        if n_samples > 1:
+        if n_samples > 1 and return_mean is not True:
             # concatenate along batch dimension -> result shape = (samples, cells, features)
             scale_list_gene = torch.cat(scale_list_gene, dim=1)
             scale_list_pro = torch.cat(scale_list_pro, dim=1)
@@ -478,10 +479,6 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
             scale_list_gene = torch.cat(scale_list_gene, dim=0)
             scale_list_pro = torch.cat(scale_list_pro, dim=0)
 
-        if return_mean is True and n_samples > 1:
-            scale_list_gene = torch.mean(scale_list_gene, dim=-1)
-            scale_list_pro = torch.mean(scale_list_pro, dim=-1)
-
         scale_list_gene = scale_list_gene.cpu().numpy()
         scale_list_pro = scale_list_pro.cpu().numpy()
         if return_numpy is None or return_numpy is False:
@@ -562,7 +559,7 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
             protein_mask = slice(None)
         else:
             all_proteins = self.scvi_setup_dict_["protein_names"]
-            protein_mask = [True if p in protein_list else False for p in all_proteins]
+            protein_mask = np.isin(all_proteins, protein_list)
 
         if n_samples > 1 and return_mean is False:
             if return_numpy is False:
@@ -596,8 +593,10 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
                     ..., protein_mask
                 ].cpu()
             py_mixing /= len(transform_batch)
+            if return_mean is True and n_samples > 1:
+                py_mixing = torch.mean(py_mixing, dim=0)
             py_mixings += [py_mixing]
-        if n_samples > 1:
+        if n_samples > 1 and return_mean is not True:
             # concatenate along batch dimension -> result shape = (samples, cells, features)
             py_mixings = torch.cat(py_mixings, dim=1)
             # (cells, features, samples)
@@ -605,9 +604,6 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
         else:
             py_mixings = torch.cat(py_mixings, dim=0)
 
-        if return_mean is True and n_samples > 1:
-            py_mixings = torch.mean(py_mixings, dim=-1)
-
         py_mixings = py_mixings.cpu().numpy()
 
         if return_numpy is True:
@@ -782,12 +778,12 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
             gene_mask = slice(None)
         else:
             all_genes = _get_var_names_from_setup_anndata(adata)
-            gene_mask = [True if gene in gene_list else False for gene in all_genes]
+            gene_mask = np.isin(all_genes, gene_list)
         if protein_list is None:
             protein_mask = slice(None)
         else:
             all_proteins = self.scvi_setup_dict_["protein_names"]
-            protein_mask = [True if p in protein_list else False for p in all_proteins]
+            protein_mask = np.isin(all_proteins, protein_list)
 
         scdl = self._make_data_loader(
             adata=adata, indices=indices, batch_size=batch_size
@@ -952,13 +948,10 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
                 rna_size_factor=rna_size_factor,
                 transform_batch=b,
             )
-            flattened = np.zeros(
-                (denoised_data.shape[0] * n_samples, denoised_data.shape[1])
-            )
-            for i in range(n_samples):
-                flattened[
-                    denoised_data.shape[0] * (i) : denoised_data.shape[0] * (i + 1)
-                ] = denoised_data[:, :, i]
+            # stack the samples along the cell axis with a single copy
+            flattened = np.empty((n_samples,) + denoised_data.shape[:2])
+            flattened[:] = np.moveaxis(denoised_data, -1, 0)
+            flattened = flattened.reshape(-1, denoised_data.shape[1])
             if log_transform is True:
                 flattened[:, : self.n_genes] = np.log(
                     flattened[:, : self.n_genes] + 1e-8
@@ -1048,6 +1041,9 @@ def _get_totalvi_protein_priors(adata, n_cells=100):
     warnings.filterwarnings("error")
 
     batch = get_from_registry(adata, _CONSTANTS.BATCH_KEY).ravel()
+    all_pro_exp = get_from_registry(adata, _CONSTANTS.PROTEIN_EXP_KEY)
+    if isinstance(all_pro_exp, pd.DataFrame):
+        all_pro_exp = all_pro_exp.to_numpy()
     cats = adata.uns["_scvi"]["categorical_mappings"]["_scvi_batch"]["mapping"]
     codes = np.arange(len(cats))
 
@@ -1055,30 +1051,31 @@ def _get_totalvi_protein_priors(adata, n_cells=100):
     for b in np.unique(codes):
         # can happen during online updates
         # the values of these batches will not be used
-        num_in_batch = np.sum(batch == b)
+        cells_in_batch = np.flatnonzero(batch == b)
+        num_in_batch = len(cells_in_batch)
         if num_in_batch == 0:
             batch_avg_mus.append(0)
             batch_avg_scales.append(1)
             continue
-        pro_exp = get_from_registry(adata, _CONSTANTS.PROTEIN_EXP_KEY)[batch == b]
-
-        # for missing batches, put dummy values -- scarches case, will be replaced anyway
-        if pro_exp.shape[0] == 0:
-            batch_avg_mus.append(0.0)
-            batch_avg_scales.append(0.05)
 
-        cells = np.random.choice(np.arange(pro_exp.shape[0]), size=n_cells)
-        if isinstance(pro_exp, pd.DataFrame):
-            pro_exp = pro_exp.to_numpy()
-        pro_exp = pro_exp[cells]
+        # only gather the subsampled cells rather than the whole batch
+        cells = np.random.choice(np.arange(num_in_batch), size=n_cells)
+        pro_exp = all_pro_exp[cells_in_batch[cells]]
+        log_pro_exp = np.log1p(pro_exp)
         gmm = GaussianMixture(n_components=2)
         mus, scales = [], []
+        # cells with fewer distinct values than components (e.g. all 0) cannot
+        # be fit, so skip the mixture for them rather than wait for it to fail
+        n_distinct = 1 + np.count_nonzero(np.diff(np.sort(log_pro_exp), axis=1), 1)
         # fit per cell GMM
-        for c in pro_exp:
-            try:
-                gmm.fit(np.log1p(c.reshape(-1, 1)))
-            # when cell is all 0
-            except ConvergenceWarning:
+        for c, fittable in zip(log_pro_exp, n_distinct >= gmm.n_components):
+            if fittable:
+                try:
+                    gmm.fit(c.reshape(-1, 1))
+                except ConvergenceWarning:
+                    fittable = False
+            # when cell cannot be fit, e.g. all 0
+            if not fittable:
                 mus.append(0)
                 scales.append(0.05)
                 continue
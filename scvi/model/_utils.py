@@ -4,7 +4,6 @@ from typing import Dict, List, Optional, Sequence, Union
 
 import anndata
 import numpy as np
-import scipy.sparse as sp_sparse
 import torch
 
 from scvi import _CONSTANTS
@@ -81,12 +80,6 @@ def scrna_raw_counts_properties(
         mean expression per gene, proportion of non-zero expression per gene, mean of normalized expression.
     """
     data = get_from_registry(adata, _CONSTANTS.X_KEY)
-    data1 = data[idx1]
-    data2 = data[idx2]
-    mean1 = np.asarray((data1).mean(axis=0)).ravel()
-    mean2 = np.asarray((data2).mean(axis=0)).ravel()
-    nonz1 = np.asarray((data1 != 0).mean(axis=0)).ravel()
-    nonz2 = np.asarray((data2 != 0).mean(axis=0)).ravel()
 
     key = "_scvi_raw_norm_scaling"
     if key not in adata.obs.keys():
@@ -96,15 +89,27 @@ def scrna_raw_counts_properties(
     else:
         scaling_factor = adata.obs[key].to_numpy().ravel().reshape(-1, 1)
 
-    if issubclass(type(data), sp_sparse.spmatrix):
-        norm_data1 = data1.multiply(scaling_factor[idx1])
-        norm_data2 = data2.multiply(scaling_factor[idx2])
+    idx1 = np.asarray(idx1)
+    idx2 = np.asarray(idx2)
+    sums1 = _raw_counts_sums(data[idx1], scaling_factor[idx1])
+    if (
+        idx1.dtype == bool
+        and idx2.dtype == bool
+        and len(idx1) == data.shape[0]
+        and not np.any(idx1 == idx2)
+    ):
+        # the second population is the rest of the cells (one vs. rest DE), so its
+        # sums follow from the totals without copying most of the matrix
+        totals = _raw_counts_sums(data, scaling_factor)
+        sums2 = tuple(total - sum1 for total, sum1 in zip(totals, sums1))
+        n1 = idx1.sum()
+        n2 = data.shape[0] - n1
     else:
-        norm_data1 = data1 * scaling_factor[idx1]
-        norm_data2 = data2 * scaling_factor[idx2]
-
-    norm_mean1 = np.asarray(norm_data1.mean(axis=0)).ravel()
-    norm_mean2 = np.asarray(norm_data2.mean(axis=0)).ravel()
+        sums2 = _raw_counts_sums(data[idx2], scaling_factor[idx2])
+        n1 = idx1.sum() if idx1.dtype == bool else len(idx1)
+        n2 = idx2.sum() if idx2.dtype == bool else len(idx2)
+    mean1, nonz1, norm_mean1 = (s / n1 for s in sums1)
+    mean2, nonz2, norm_mean2 = (s / n2 for s in sums2)
 
     properties = dict(
         raw_mean1=mean1,
@@ -117,6 +122,14 @@ def scrna_raw_counts_properties(
     return properties
 
 
+def _raw_counts_sums(data, scaling_factor):
+    """Per gene sums of counts, non-zero counts and normalized counts."""
+    counts = np.asarray(data.sum(axis=0, dtype=np.float64)).ravel()
+    non_zeros = np.asarray((data != 0).sum(axis=0)).ravel()
+    norm_counts = np.asarray(data.T.dot(scaling_factor.ravel())).ravel()
+    return counts, non_zeros, norm_counts
+
+
 def cite_seq_raw_counts_properties(
     adata: anndata.AnnData,
     idx1: Union[List[int], np.ndarray],
@@ -113,6 +113,13 @@ class BaseModelClass(ABC):
 
         if "num_workers" not in data_loader_kwargs:
             data_loader_kwargs.update({"num_workers": settings.dl_num_workers})
+        if "pin_memory" not in data_loader_kwargs:
+            # page-locked minibatches let the non-blocking copies made by
+            # `auto_move_data` overlap with compute on the GPU
+            pin_memory = (
+                settings.dl_pin_memory_gpu_training and self.device.type == "cuda"
+            )
+            data_loader_kwargs.update({"pin_memory": pin_memory})
 
         dl = data_loader_class(
             adata,
@@ -14,13 +14,16 @@ def compute_elbo(vae, data_loader, feed_labels=True, **kwargs):
     It still gives good insights on the modeling of the data, and is fast to compute.
     """
     # Iterate once over the data and compute the elbo
+    # sums stay on the device, in double precision, so the host only waits
+    # for the result once
     elbo = 0
     for tensors in data_loader:
         _, _, scvi_loss = vae(tensors, **kwargs)
 
         recon_loss = scvi_loss.reconstruction_loss
         kl_local = scvi_loss.kl_local
-        elbo += torch.sum(recon_loss + kl_local).item()
+        elbo += torch.sum(recon_loss + kl_local).double()
+    elbo = elbo.item()
 
     kl_global = scvi_loss.kl_global
     n_samples = len(data_loader.indices)
@@ -43,12 +46,12 @@ def compute_reconstruction_error(vae, data_loader, **kwargs):
         _, _, losses = vae(tensors, loss_kwargs=loss_kwargs)
         for key, value in losses._reconstruction_loss.items():
             if key in log_lkl:
-                log_lkl[key] += torch.sum(value).item()
+                log_lkl[key] += torch.sum(value).double()
             else:
                 log_lkl[key] = 0.0
 
     n_samples = len(data_loader.indices)
     for key, value in log_lkl.items():
-        log_lkl[key] = log_lkl[key] / n_samples
+        log_lkl[key] = float(log_lkl[key]) / n_samples
         log_lkl[key] = -log_lkl[key]
     return log_lkl
@@ -1,6 +1,7 @@
 import inspect
 import logging
 import warnings
+from contextlib import nullcontext
 from functools import partial
 from typing import Dict, Iterable, Optional, Sequence, Union
 
@@ -50,6 +51,7 @@ class RNASeqMixin:
         batch_size: Optional[int] = None,
         return_mean: bool = True,
         return_numpy: Optional[bool] = None,
+        use_amp: bool = False,
     ) -> Union[np.ndarray, pd.DataFrame]:
         r"""
         Returns the normalized (decoded) gene expression.
@@ -87,6 +89,9 @@ class RNASeqMixin:
             Return a :class:`~numpy.ndarray` instead of a :class:`~pandas.DataFrame`. DataFrame includes
             gene names as columns. If either `n_samples=1` or `return_mean=True`, defaults to `False`.
             Otherwise, it defaults to `True`.
+        use_amp
+            Run the encoder and decoder in mixed precision. Only applies when the model is
+            on a GPU, where it trades a little precision for faster matrix multiplications.
 
         Returns
         -------
@@ -108,7 +113,7 @@ class RNASeqMixin:
             gene_mask = slice(None)
         else:
             all_genes = _get_var_names_from_setup_anndata(adata)
-            gene_mask = [True if gene in gene_list else False for gene in all_genes]
+            gene_mask = np.isin(all_genes, gene_list)
 
         if n_samples > 1 and return_mean is False:
             if return_numpy is False:
@@ -123,35 +128,52 @@ class RNASeqMixin:
             generative_output_key = "px_scale"
             scaling = library_size
 
-        exprs = []
+        # autocast is only entered for mixed precision on a GPU
+        if use_amp and self.device.type == "cuda":
+            amp_context = torch.cuda.amp.autocast()
+        else:
+            amp_context = nullcontext()
+
+        # minibatch outputs are written into a preallocated array, allocated
+        # once the output shape is known, instead of concatenated at the end
+        exprs = None
+        n_cells_done = 0
         for tensors in scdl:
-            per_batch_exprs = []
-            for batch in transform_batch:
-                generative_kwargs = self._get_transform_batch_gen_kwargs(batch)
-                inference_kwargs = dict(n_samples=n_samples)
-                _, generative_outputs = self.module.forward(
-                    tensors=tensors,
-                    inference_kwargs=inference_kwargs,
-                    generative_kwargs=generative_kwargs,
-                    compute_loss=False,
+            per_batch_exprs = 0
+            with amp_context:
+                # the encoder does not depend on the batch to condition on,
+                # so run it once and only decode once per batch
+                inference_inputs = self.module._get_inference_input(tensors)
+                inference_outputs = self.module.inference(
+                    **inference_inputs, n_samples=n_samples
+                )
+                generative_inputs = self.module._get_generative_input(
+                    tensors, inference_outputs
                 )
-                output = generative_outputs[generative_output_key]
-                output = output[..., gene_mask]
-                output *= scaling
-                output = output.cpu().numpy()
-                per_batch_exprs.append(output)
-            per_batch_exprs = np.stack(
-                per_batch_exprs
-            )  # shape is (len(transform_batch) x batch_size x n_var)
-            exprs += [per_batch_exprs.mean(0)]
-
-        if n_samples > 1:
+                for batch in transform_batch:
+                    generative_kwargs = self._get_transform_batch_gen_kwargs(batch)
+                    generative_outputs = self.module.generative(
+                        **generative_inputs, **generative_kwargs
+                    )
+                    output = generative_outputs[generative_output_key]
+                    output = output[..., gene_mask]
+                    output *= scaling
+                    output = output.float().cpu().numpy()
+                    per_batch_exprs += output
+            # average over transform_batch
+            per_batch_exprs = per_batch_exprs / len(transform_batch)
+            if n_samples > 1 and return_mean:
+                # average the posterior samples of each minibatch right away
+                # instead of keeping all of them until the end
+                per_batch_exprs = per_batch_exprs.mean(0)
             # The -2 axis correspond to cells.
-            exprs = np.concatenate(exprs, axis=-2)
-        else:
-            exprs = np.concatenate(exprs, axis=0)
-        if n_samples > 1 and return_mean:
-            exprs = exprs.mean(0)
+            n_cells_batch = per_batch_exprs.shape[-2]
+            if exprs is None:
+                shape = list(per_batch_exprs.shape)
+                shape[-2] = len(indices)
+                exprs = np.empty(shape, dtype=per_batch_exprs.dtype)
+            exprs[..., n_cells_done : n_cells_done + n_cells_batch, :] = per_batch_exprs
+            n_cells_done += n_cells_batch
 
         if return_numpy is None or return_numpy is False:
             return pd.DataFrame(
@@ -279,7 +301,7 @@ class RNASeqMixin:
             gene_mask = slice(None)
         else:
             all_genes = _get_var_names_from_setup_anndata(adata)
-            gene_mask = [True if gene in gene_list else False for gene in all_genes]
+            gene_mask = np.isin(all_genes, gene_list)
 
         x_new = []
         for tensors in scdl:
@@ -423,13 +445,10 @@ class RNASeqMixin:
                 rna_size_factor=rna_size_factor,
                 transform_batch=b,
             )
-            flattened = np.zeros(
-                (denoised_data.shape[0] * n_samples, denoised_data.shape[1])
-            )
-            for i in range(n_samples):
-                flattened[
-                    denoised_data.shape[0] * (i) : denoised_data.shape[0] * (i + 1)
-                ] = denoised_data[:, :, i]
+            # stack the samples along the cell axis with a single copy
+            flattened = np.empty((n_samples,) + denoised_data.shape[:2])
+            flattened[:] = np.moveaxis(denoised_data, -1, 0)
+            flattened = flattened.reshape(-1, denoised_data.shape[1])
             if correlation_type == "pearson":
                 corr_matrix = np.corrcoef(flattened, rowvar=False)
             elif correlation_type == "spearman":
@@ -51,6 +51,7 @@ class VAEMixin:
         indices: Optional[Sequence[int]] = None,
         n_mc_samples: int = 1000,
         batch_size: Optional[int] = None,
+        n_mc_samples_per_pass: Optional[int] = None,
     ) -> float:
         """
         Return the marginal LL for the data.
@@ -69,6 +70,9 @@ class VAEMixin:
             Number of Monte Carlo samples to use for marginal LL estimation.
         batch_size
             Minibatch size for data loading into model. Defaults to `scvi.settings.batch_size`.
+        n_mc_samples_per_pass
+            Number of Monte Carlo samples drawn for each pass over the data. Every
+            minibatch is loaded once per pass. If `None`, uses the module's default.
         """
         adata = self._validate_anndata(adata)
         if indices is None:
@@ -77,9 +81,12 @@ class VAEMixin:
             adata=adata, indices=indices, batch_size=batch_size
         )
         if hasattr(self.module, "marginal_ll"):
+            marginal_ll_kwargs = dict(n_mc_samples=n_mc_samples)
+            if n_mc_samples_per_pass is not None:
+                marginal_ll_kwargs["n_mc_samples_per_pass"] = n_mc_samples_per_pass
             log_lkl = 0
             for tensors in scdl:
-                log_lkl += self.module.marginal_ll(tensors, n_mc_samples=n_mc_samples)
+                log_lkl += self.module.marginal_ll(tensors, **marginal_ll_kwargs)
         else:
             raise NotImplementedError(
                 "marginal_ll is not implemented for current model. "
@@ -12,6 +12,7 @@ from scvi.distributions import NegativeBinomial, ZeroInflatedNegativeBinomial
 from scvi.module.base import LossRecorder, auto_move_data
 from scvi.nn import one_hot
 
+from ._utils import kl_standard_normal
 from ._vae import VAE
 
 torch.backends.cudnn.benchmark = True
@@ -376,12 +377,7 @@ class AutoZIVAE(VAE):
         local_l_var = tensors[_CONSTANTS.LOCAL_L_VAR_KEY]
 
         # KL divergences wrt z_n,l_n
-        mean = torch.zeros_like(qz_m)
-        scale = torch.ones_like(qz_v)
-
-        kl_divergence_z = kl(Normal(qz_m, torch.sqrt(qz_v)), Normal(mean, scale)).sum(
-            dim=1
-        )
+        kl_divergence_z = kl_standard_normal(qz_m, qz_v)
         kl_divergence_l = kl(
             Normal(ql_m, torch.sqrt(ql_v)),
             Normal(local_l_mean, torch.sqrt(local_l_var)),
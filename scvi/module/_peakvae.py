@@ -277,11 +277,12 @@ class PEAKVAE(BaseModuleClass):
         )
 
         if n_samples > 1:
-            qz_m = qz_m.unsqueeze(0).expand((n_samples, qz_m.size(0), qz_m.size(1)))
-            qz_v = qz_v.unsqueeze(0).expand((n_samples, qz_v.size(0), qz_v.size(1)))
+            # the scale is taken before expanding, so once per cell only
             # when z is normal, untran_z == z
-            untran_z = Normal(qz_m, qz_v.sqrt()).sample()
+            untran_z = Normal(qz_m, qz_v.sqrt()).sample((n_samples,))
             z = self.z_encoder.z_transformation(untran_z)
+            qz_m = qz_m.unsqueeze(0).expand((n_samples, qz_m.size(0), qz_m.size(1)))
+            qz_v = qz_v.unsqueeze(0).expand((n_samples, qz_v.size(0), qz_v.size(1)))
 
         return dict(d=d, qz_m=qz_m, qz_v=qz_v, z=z)
 
@@ -12,7 +12,7 @@ from scvi.module.base import LossRecorder, auto_move_data
 from scvi.nn import Decoder, Encoder
 
 from ._classifier import Classifier
-from ._utils import broadcast_labels
+from ._utils import broadcast_labels, kl_standard_normal
 from ._vae import VAE
 
 
@@ -251,12 +251,7 @@ class SCANVAE(VAE):
         reconst_loss = self.get_reconstruction_loss(x, px_rate, px_r, px_dropout)
 
         # KL Divergence
-        mean = torch.zeros_like(qz2_m)
-        scale = torch.ones_like(qz2_v)
-
-        kl_divergence_z2 = kl(
-            Normal(qz2_m, torch.sqrt(qz2_v)), Normal(mean, scale)
-        ).sum(dim=1)
+        kl_divergence_z2 = kl_standard_normal(qz2_m, qz2_v)
         loss_z1_unweight = -Normal(pz1_m, torch.sqrt(pz1_v)).log_prob(z1s).sum(dim=-1)
         loss_z1_weight = Normal(qz1_m, torch.sqrt(qz1_v)).log_prob(z1).sum(dim=-1)
         if not self.use_observed_lib_size:
@@ -18,6 +18,8 @@ from scvi.distributions import (
 from scvi.module.base import BaseModuleClass, LossRecorder, auto_move_data
 from scvi.nn import DecoderTOTALVI, EncoderTOTALVI, one_hot
 
+from ._utils import kl_standard_normal, normal_log_prob
+
 torch.backends.cudnn.benchmark = True
 
 
@@ -125,6 +127,17 @@ class TOTALVAE(BaseModuleClass):
         self.protein_dispersion = protein_dispersion
         self.latent_distribution = latent_distribution
         self.protein_batch_mask = protein_batch_mask
+        if protein_batch_mask is not None:
+            # one row per batch, so minibatch masks are a single gather; batches
+            # without an entry keep all proteins. Not persistent as it is
+            # rebuilt from `protein_batch_mask`
+            n_rows = max(n_batch, max(protein_batch_mask) + 1)
+            batch_masks = np.ones((n_rows, n_input_proteins), dtype=np.float32)
+            for b, mask in protein_batch_mask.items():
+                batch_masks[b] = mask
+            self.register_buffer(
+                "protein_batch_masks", torch.from_numpy(batch_masks), persistent=False
+            )
         self.use_observed_lib_size = use_observed_lib_size
         self.encode_covariates = encode_covariates
 
@@ -430,10 +443,10 @@ class TOTALVAE(BaseModuleClass):
         x_ = x
         y_ = y
         if self.use_observed_lib_size:
-            library_gene = x.sum(1).unsqueeze(1)
+            library_gene = x.sum(1, keepdim=True)
         if self.log_variational:
-            x_ = torch.log(1 + x_)
-            y_ = torch.log(1 + y_)
+            x_ = torch.log1p(x_)
+            y_ = torch.log1p(y_)
 
         if cont_covs is not None and self.encode_covariates is True:
             encoder_input = torch.cat((x_, y_, cont_covs), dim=-1)
@@ -453,13 +466,14 @@ class TOTALVAE(BaseModuleClass):
             library_gene = latent["l"]
 
         if n_samples > 1:
+            # the scales are taken before expanding, so once per cell only
+            untran_z = Normal(qz_m, qz_v.sqrt()).sample((n_samples,))
+            z = self.encoder.z_transformation(untran_z)
+            untran_l = Normal(ql_m, ql_v.sqrt()).sample((n_samples,))
             qz_m = qz_m.unsqueeze(0).expand((n_samples, qz_m.size(0), qz_m.size(1)))
             qz_v = qz_v.unsqueeze(0).expand((n_samples, qz_v.size(0), qz_v.size(1)))
-            untran_z = Normal(qz_m, qz_v.sqrt()).sample()
-            z = self.encoder.z_transformation(untran_z)
             ql_m = ql_m.unsqueeze(0).expand((n_samples, ql_m.size(0), ql_m.size(1)))
             ql_v = ql_v.unsqueeze(0).expand((n_samples, ql_v.size(0), ql_v.size(1)))
-            untran_l = Normal(ql_m, ql_v.sqrt()).sample()
             if self.use_observed_lib_size:
                 library_gene = library_gene.unsqueeze(0).expand(
                     (n_samples, library_gene.size(0), library_gene.size(1))
@@ -558,13 +572,9 @@ class TOTALVAE(BaseModuleClass):
         y = tensors[_CONSTANTS.PROTEIN_EXP_KEY]
 
         if self.protein_batch_mask is not None:
-            pro_batch_mask_minibatch = torch.zeros_like(y)
-            for b in torch.unique(batch_index):
-                b_indices = (batch_index == b).reshape(-1)
-                pro_batch_mask_minibatch[b_indices] = torch.tensor(
-                    self.protein_batch_mask[b.item()].astype(np.float32),
-                    device=y.device,
-                )
+            pro_batch_mask_minibatch = self.protein_batch_masks[
+                batch_index.long().view(-1)
+            ]
         else:
             pro_batch_mask_minibatch = None
 
@@ -573,7 +583,7 @@ class TOTALVAE(BaseModuleClass):
         )
 
         # KL Divergence
-        kl_div_z = kl(Normal(qz_m, torch.sqrt(qz_v)), Normal(0, 1)).sum(dim=1)
+        kl_div_z = kl_standard_normal(qz_m, qz_v)
         if not self.use_observed_lib_size:
             kl_div_l_gene = kl(
                 Normal(ql_m, torch.sqrt(ql_v)),
@@ -642,7 +652,7 @@ class TOTALVAE(BaseModuleClass):
         x = tensors[_CONSTANTS.X_KEY]
         local_l_mean = tensors[_CONSTANTS.LOCAL_L_MEAN_KEY]
         local_l_var = tensors[_CONSTANTS.LOCAL_L_VAR_KEY]
-        to_sum = torch.zeros(x.size()[0], n_mc_samples)
+        to_sum = torch.zeros(x.size()[0], n_mc_samples, device=x.device)
 
         for i in range(n_mc_samples):
             # Distribution parameters and sampled variables
@@ -664,16 +674,12 @@ class TOTALVAE(BaseModuleClass):
             reconst_loss_protein = reconst_loss["reconst_loss_protein"]
 
             # Log-probabilities
-            p_l_gene = (
-                Normal(local_l_mean, local_l_var.sqrt())
-                .log_prob(log_library)
-                .sum(dim=-1)
-            )
-            p_z = Normal(0, 1).log_prob(z).sum(dim=-1)
+            p_l_gene = normal_log_prob(log_library, local_l_mean, local_l_var)
+            p_z = normal_log_prob(z)
             p_mu_back = self.back_mean_prior.log_prob(log_pro_back_mean).sum(dim=-1)
             p_xy_zl = -(reconst_loss_gene + reconst_loss_protein)
-            q_z_x = Normal(qz_m, qz_v.sqrt()).log_prob(z).sum(dim=-1)
-            q_l_x = Normal(ql_m, ql_v.sqrt()).log_prob(log_library).sum(dim=-1)
+            q_z_x = normal_log_prob(z, qz_m, qz_v)
+            q_l_x = normal_log_prob(log_library, ql_m, ql_v)
             q_mu_back = (
                 Normal(py_["back_alpha"], py_["back_beta"])
                 .log_prob(log_pro_back_mean)
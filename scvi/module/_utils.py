@@ -1,3 +1,5 @@
+import math
+
 import torch
 
 from scvi.nn import one_hot
@@ -35,9 +37,36 @@ def broadcast_labels(y, *o, n_broadcast=-1):
 
 
 def enumerate_discrete(x, y_dim):
-    def batch(batch_size, label):
-        labels = torch.ones(batch_size, 1, device=x.device, dtype=torch.long) * label
-        return one_hot(labels, y_dim)
+    # one block of rows per label, built in a single allocation rather than
+    # as y_dim one-hot blocks that are then concatenated
+    labels = torch.arange(y_dim, device=x.device).repeat_interleave(x.size(0))
+    return one_hot(labels.unsqueeze(1), y_dim)
+
+
+def normal_log_prob(x, mean=None, var=None):
+    """
+    Log-density of a diagonal Gaussian, summed over the last dimension.
+
+    Written in closed form to avoid building a :class:`~torch.distributions.Normal`
+    and its intermediate tensors. Defaults to the standard normal.
+    """
+    if mean is None:
+        sq_dist = x.pow(2)
+    else:
+        sq_dist = (x - mean).pow(2)
+    if var is None:
+        log_prob = sq_dist + math.log(2 * math.pi)
+    else:
+        log_prob = sq_dist / var + var.log() + math.log(2 * math.pi)
+    return -0.5 * log_prob.sum(dim=-1)
+
 
-    batch_size = x.size(0)
-    return torch.cat([batch(batch_size, i) for i in range(y_dim)])
+def kl_standard_normal(mean: torch.Tensor, var: torch.Tensor) -> torch.Tensor:
+    """
+    KL divergence of a diagonal Gaussian from the standard normal.
+
+    Summed over the last dimension. The closed form needs neither prior tensors
+    nor the square root of the variance, unlike
+    ``kl(Normal(mean, var.sqrt()), Normal(0, 1))``.
+    """
+    return 0.5 * (var + mean.pow(2) - 1.0 - var.log()).sum(dim=-1)
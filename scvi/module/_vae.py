@@ -15,6 +15,8 @@ from scvi.distributions import NegativeBinomial, ZeroInflatedNegativeBinomial
 from scvi.module.base import BaseModuleClass, LossRecorder, auto_move_data
 from scvi.nn import DecoderSCVI, Encoder, LinearDecoderSCVI, one_hot
 
+from ._utils import kl_standard_normal, normal_log_prob
+
 torch.backends.cudnn.benchmark = True
 
 
@@ -222,9 +224,9 @@ class VAE(BaseModuleClass):
         """
         x_ = x
         if self.use_observed_lib_size:
-            library = torch.log(x.sum(1)).unsqueeze(1)
+            library = torch.log(x.sum(1, keepdim=True))
         if self.log_variational:
-            x_ = torch.log(1 + x_)
+            x_ = torch.log1p(x_)
 
         if cont_covs is not None and self.encode_covariates is True:
             encoder_input = torch.cat((x_, cont_covs), dim=-1)
@@ -243,19 +245,20 @@ class VAE(BaseModuleClass):
             library = library_encoded
 
         if n_samples > 1:
-            qz_m = qz_m.unsqueeze(0).expand((n_samples, qz_m.size(0), qz_m.size(1)))
-            qz_v = qz_v.unsqueeze(0).expand((n_samples, qz_v.size(0), qz_v.size(1)))
+            # the scales are taken before expanding, so once per cell only
             # when z is normal, untran_z == z
-            untran_z = Normal(qz_m, qz_v.sqrt()).sample()
+            untran_z = Normal(qz_m, qz_v.sqrt()).sample((n_samples,))
             z = self.z_encoder.z_transformation(untran_z)
-            ql_m = ql_m.unsqueeze(0).expand((n_samples, ql_m.size(0), ql_m.size(1)))
-            ql_v = ql_v.unsqueeze(0).expand((n_samples, ql_v.size(0), ql_v.size(1)))
             if self.use_observed_lib_size:
                 library = library.unsqueeze(0).expand(
                     (n_samples, library.size(0), library.size(1))
                 )
             else:
-                library = Normal(ql_m, ql_v.sqrt()).sample()
+                library = Normal(ql_m, ql_v.sqrt()).sample((n_samples,))
+            qz_m = qz_m.unsqueeze(0).expand((n_samples, qz_m.size(0), qz_m.size(1)))
+            qz_v = qz_v.unsqueeze(0).expand((n_samples, qz_v.size(0), qz_v.size(1)))
+            ql_m = ql_m.unsqueeze(0).expand((n_samples, ql_m.size(0), ql_m.size(1)))
+            ql_v = ql_v.unsqueeze(0).expand((n_samples, ql_v.size(0), ql_v.size(1)))
 
         outputs = dict(z=z, qz_m=qz_m, qz_v=qz_v, ql_m=ql_m, ql_v=ql_v, library=library)
         return outputs
@@ -319,12 +322,7 @@ class VAE(BaseModuleClass):
         px_r = generative_outputs["px_r"]
         px_dropout = generative_outputs["px_dropout"]
 
-        mean = torch.zeros_like(qz_m)
-        scale = torch.ones_like(qz_v)
-
-        kl_divergence_z = kl(Normal(qz_m, torch.sqrt(qz_v)), Normal(mean, scale)).sum(
-            dim=1
-        )
+        kl_divergence_z = kl_standard_normal(qz_m, qz_v)
 
         if not self.use_observed_lib_size:
             kl_divergence_l = kl(
@@ -432,16 +430,25 @@ class VAE(BaseModuleClass):
 
     @torch.no_grad()
     @auto_move_data
-    def marginal_ll(self, tensors, n_mc_samples):
+    def marginal_ll(self, tensors, n_mc_samples, n_mc_samples_per_pass=25):
         sample_batch = tensors[_CONSTANTS.X_KEY]
         local_l_mean = tensors[_CONSTANTS.LOCAL_L_MEAN_KEY]
         local_l_var = tensors[_CONSTANTS.LOCAL_L_VAR_KEY]
 
-        to_sum = torch.zeros(sample_batch.size()[0], n_mc_samples)
+        to_sum = torch.zeros(
+            n_mc_samples, sample_batch.size()[0], device=sample_batch.device
+        )
 
-        for i in range(n_mc_samples):
+        # draw the samples in blocks, so the decoded (samples, cells, genes)
+        # tensors stay bounded while the encoder runs once per block
+        for start in range(0, n_mc_samples, n_mc_samples_per_pass):
+            n_samples = min(n_mc_samples_per_pass, n_mc_samples - start)
             # Distribution parameters and sampled variables
-            inference_outputs, generative_outputs, losses = self.forward(tensors)
+            inference_outputs, generative_outputs = self.forward(
+                tensors,
+                inference_kwargs=dict(n_samples=n_samples),
+                compute_loss=False,
+            )
             qz_m = inference_outputs["qz_m"]
             qz_v = inference_outputs["qz_v"]
             z = inference_outputs["z"]
@@ -450,22 +457,24 @@ class VAE(BaseModuleClass):
             library = inference_outputs["library"]
 
             # Reconstruction Loss
-            reconst_loss = losses.reconstruction_loss
+            reconst_loss = self.get_reconstruction_loss(
+                sample_batch,
+                generative_outputs["px_rate"],
+                generative_outputs["px_r"],
+                generative_outputs["px_dropout"],
+            )
 
             # Log-probabilities
-            p_l = Normal(local_l_mean, local_l_var.sqrt()).log_prob(library).sum(dim=-1)
-            p_z = (
-                Normal(torch.zeros_like(qz_m), torch.ones_like(qz_v))
-                .log_prob(z)
-                .sum(dim=-1)
-            )
+            p_l = normal_log_prob(library, local_l_mean, local_l_var)
+            p_z = normal_log_prob(z)
             p_x_zl = -reconst_loss
-            q_z_x = Normal(qz_m, qz_v.sqrt()).log_prob(z).sum(dim=-1)
-            q_l_x = Normal(ql_m, ql_v.sqrt()).log_prob(library).sum(dim=-1)
+            q_z_x = normal_log_prob(z, qz_m, qz_v)
+            q_l_x = normal_log_prob(library, ql_m, ql_v)
 
-            to_sum[:, i] = p_z + p_l + p_x_zl - q_z_x - q_l_x
+            log_weights = p_z + p_l + p_x_zl - q_z_x - q_l_x
+            to_sum[start : start + n_samples] = log_weights.reshape(n_samples, -1)
 
-        batch_log_lkl = logsumexp(to_sum, dim=-1) - np.log(n_mc_samples)
+        batch_log_lkl = logsumexp(to_sum, dim=0) - np.log(n_mc_samples)
         log_lkl = torch.sum(batch_log_lkl).item()
         return log_lkl
 
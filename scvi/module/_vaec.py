@@ -2,13 +2,14 @@
 import numpy as np
 import torch
 from torch.distributions import Normal
-from torch.distributions import kl_divergence as kl
 
 from scvi import _CONSTANTS
 from scvi.distributions import NegativeBinomial
 from scvi.module.base import BaseModuleClass, LossRecorder, auto_move_data
 from scvi.nn import Encoder, FCLayers
 
+from ._utils import kl_standard_normal
+
 torch.backends.cudnn.benchmark = True
 
 
@@ -129,9 +130,9 @@ class VAEC(BaseModuleClass):
         Runs the inference (encoder) model.
         """
         x_ = x
-        library = torch.log(x.sum(1)).unsqueeze(1)
+        library = torch.log(x.sum(1, keepdim=True))
         if self.log_variational:
-            x_ = torch.log(1 + x_)
+            x_ = torch.log1p(x_)
 
         qz_m, qz_v, z = self.z_encoder(x_, y)
 
@@ -171,12 +172,7 @@ class VAEC(BaseModuleClass):
         px_rate = generative_outputs["px_rate"]
         px_r = generative_outputs["px_r"]
 
-        mean = torch.zeros_like(qz_m)
-        scale = torch.ones_like(qz_v)
-
-        kl_divergence_z = kl(Normal(qz_m, torch.sqrt(qz_v)), Normal(mean, scale)).sum(
-            dim=1
-        )
+        kl_divergence_z = kl_standard_normal(qz_m, qz_v)
 
         reconst_loss = -NegativeBinomial(px_rate, logits=px_r).log_prob(x).sum(-1)
         scaling_factor = self.ct_weight[y.long()[:, 0]]
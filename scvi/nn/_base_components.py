@@ -174,10 +174,16 @@ class FCLayers(nn.Module):
             for layer in layers:
                 if layer is not None:
                     if isinstance(layer, nn.BatchNorm1d):
-                        if x.dim() == 3:
+                        if x.dim() == 3 and layer.training:
+                            # batch statistics are computed for each sample
                             x = torch.cat(
                                 [(layer(slice_x)).unsqueeze(0) for slice_x in x], dim=0
                             )
+                        elif x.dim() == 3:
+                            # running statistics apply to every row alike, so
+                            # normalize all samples at once; reshape also copes with
+                            # non-contiguous (expanded or permuted) inputs
+                            x = layer(x.reshape(-1, x.size(-1))).view(x.size())
                         else:
                             x = layer(x)
                     else:
@@ -3,7 +3,7 @@ import logging
 from pytorch_lightning.callbacks import ProgressBarBase
 
 from scvi import settings
-from scvi.utils import track
+from scvi.utils._track import track
 
 logger = logging.getLogger(__name__)
 
@@ -1,16 +1,17 @@
 import logging
 import warnings
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
 import pandas as pd
 import pytorch_lightning as pl
 
 from scvi.dataloaders import DataSplitter, SemiSupervisedDataSplitter
-from scvi.model._utils import parse_use_gpu_arg
-from scvi.model.base import BaseModelClass
 from scvi.train import Trainer
 
+if TYPE_CHECKING:
+    from scvi.model.base import BaseModelClass
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,7 +51,7 @@ class TrainRunner:
 
     def __init__(
         self,
-        model: BaseModelClass,
+        model: "BaseModelClass",
         training_plan: pl.LightningModule,
         data_splitter: Union[SemiSupervisedDataSplitter, DataSplitter],
         max_epochs: int,
@@ -60,6 +61,9 @@ class TrainRunner:
         self.training_plan = training_plan
         self.data_splitter = data_splitter
         self.model = model
+        # imported here as scvi.model imports this module
+        from scvi.model._utils import parse_use_gpu_arg
+
         gpus, device = parse_use_gpu_arg(use_gpu)
         self.gpus = gpus
         self.device = device
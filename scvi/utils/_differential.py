@@ -29,7 +29,11 @@ class DifferentialComputation:
     Parameters
     ----------
     model_fn
-        Function in model API to get values from.
+        Function in model API to get values from. It is called with `adata` and the
+        keyword arguments `indices`, `transform_batch` and `n_samples_overall`. When
+        `n_samples_overall` is None, it must return one row per entry of `indices`, in
+        the same order, as done when the cells of several selections are decoded
+        together.
     adata
         AnnData setup with scvi
     """
@@ -175,18 +179,31 @@ class DifferentialComputation:
         #     )
         eps = 1e-8
         # Normalized means sampling for both populations
-        scales_batches_1 = self.scale_sampler(
-            selection=idx1,
-            batchid=batchid1,
-            use_observed_batches=use_observed_batches,
-            n_samples=n_samples,
-        )
-        scales_batches_2 = self.scale_sampler(
-            selection=idx2,
-            batchid=batchid2,
-            use_observed_batches=use_observed_batches,
-            n_samples=n_samples,
-        )
+        if (batchid1 is None and batchid2 is None) or (
+            batchid1 is not None
+            and batchid2 is not None
+            and np.array_equal(batchid1, batchid2)
+        ):
+            # both populations are decoded together, one model pass per batch
+            scales_batches_1, scales_batches_2 = self._scale_sampler(
+                selections=[idx1, idx2],
+                batchid=batchid1,
+                use_observed_batches=use_observed_batches,
+                n_samples=n_samples,
+            )
+        else:
+            scales_batches_1 = self.scale_sampler(
+                selection=idx1,
+                batchid=batchid1,
+                use_observed_batches=use_observed_batches,
+                n_samples=n_samples,
+            )
+            scales_batches_2 = self.scale_sampler(
+                selection=idx2,
+                batchid=batchid2,
+                use_observed_batches=use_observed_batches,
+                n_samples=n_samples,
+            )
 
         px_scale_mean1 = scales_batches_1["scale"].mean(axis=0)
         px_scale_mean2 = scales_batches_2["scale"].mean(axis=0)
@@ -389,6 +406,31 @@ class DifferentialComputation:
             `batch`
             associated batch ids
 
+        """
+        return self._scale_sampler(
+            selections=[selection],
+            n_samples=n_samples,
+            n_samples_per_cell=n_samples_per_cell,
+            batchid=batchid,
+            use_observed_batches=use_observed_batches,
+            give_mean=give_mean,
+        )[0]
+
+    def _scale_sampler(
+        self,
+        selections: List[Union[List[bool], np.ndarray]],
+        n_samples: Optional[int] = 5000,
+        n_samples_per_cell: Optional[int] = None,
+        batchid: Optional[Sequence[Union[Number, str]]] = None,
+        use_observed_batches: Optional[bool] = False,
+        give_mean: Optional[bool] = False,
+    ) -> List[dict]:
+        """
+        Samples the posterior scale of several cell selections at once.
+
+        The sampled cells of all selections are decoded in a single call of
+        `model_fn` per batch, and the output split back by selection. See
+        :meth:`scale_sampler` for the parameters.
         """
         # Get overall number of desired samples and desired batches
         if batchid is None and not use_observed_batches:
@@ -398,52 +440,75 @@ class DifferentialComputation:
             if batchid is not None:
                 raise ValueError("Unconsistent batch policy")
             batchid = [None]
-        if n_samples is None and n_samples_per_cell is None:
-            n_samples = 5000
-        elif n_samples_per_cell is not None and n_samples is None:
-            n_samples = n_samples_per_cell * len(selection)
+
         if (n_samples_per_cell is not None) and (n_samples is not None):
             warnings.warn(
                 "n_samples and n_samples_per_cell were provided. Ignoring n_samples_per_cell"
             )
-        n_samples = int(n_samples / len(batchid))
-        if n_samples == 0:
-            warnings.warn(
-                "very small sample size, please consider increasing `n_samples`"
-            )
-            n_samples = 2
-
-        # Selection of desired cells for sampling
-        if selection is None:
-            raise ValueError("selections should be a list of cell subsets indices")
-        selection = np.asarray(selection)
-        if selection.dtype is np.dtype("bool"):
-            if len(selection) < self.adata.shape[0]:
-                raise ValueError("Mask must be same length as adata.")
-            selection = np.asarray(np.where(selection)[0].ravel())
+        idx_selected = []
+        n_samples_selected = []
+        for selection in selections:
+            # Selection of desired cells for sampling
+            if selection is None:
+                raise ValueError("selections should be a list of cell subsets indices")
+            selection = np.asarray(selection)
+            if selection.dtype is np.dtype("bool"):
+                if len(selection) < self.adata.shape[0]:
+                    raise ValueError("Mask must be same length as adata.")
+                selection = np.asarray(np.where(selection)[0].ravel())
+            idx_selected.append(np.arange(self.adata.shape[0])[selection])
+
+            n_samples_sel = n_samples
+            if n_samples is None and n_samples_per_cell is None:
+                n_samples_sel = 5000
+            elif n_samples_per_cell is not None and n_samples is None:
+                n_samples_sel = n_samples_per_cell * len(selection)
+            n_samples_sel = int(n_samples_sel / len(batchid))
+            if n_samples_sel == 0:
+                warnings.warn(
+                    "very small sample size, please consider increasing `n_samples`"
+                )
+                n_samples_sel = 2
+            n_samples_selected.append(n_samples_sel)
 
         # Sampling loop
-        px_scales = []
-        batch_ids = []
+        px_scales = [[] for _ in selections]
+        batch_ids = [[] for _ in selections]
+        split_points = np.cumsum(n_samples_selected)[:-1]
         for batch_idx in batchid:
-            idx_selected = np.arange(self.adata.shape[0])[selection]
-            px_scales.append(
-                self.model_fn(
-                    self.adata,
-                    indices=idx_selected,
-                    transform_batch=batch_idx,
-                    n_samples_overall=n_samples,
+            if len(selections) == 1:
+                # model_fn subsamples the selected cells itself
+                indices, n_samples_overall = idx_selected[0], n_samples_selected[0]
+            else:
+                # cells are drawn here so that all selections share one call
+                indices = np.concatenate(
+                    [
+                        np.random.choice(idx, n)
+                        for idx, n in zip(idx_selected, n_samples_selected)
+                    ]
                 )
+                n_samples_overall = None
+            px_scales_batch = self.model_fn(
+                self.adata,
+                indices=indices,
+                transform_batch=batch_idx,
+                n_samples_overall=n_samples_overall,
             )
             batch_idx = batch_idx if batch_idx is not None else np.nan
-            batch_ids.append([batch_idx] * px_scales[-1].shape[0])
-        px_scales = np.concatenate(px_scales)
-        batch_ids = np.concatenate(batch_ids).reshape(-1)
-        if px_scales.shape[0] != batch_ids.shape[0]:
-            raise ValueError("sampled scales and batches have inconsistent shapes")
-        if give_mean:
-            px_scales = px_scales.mean(0)
-        return dict(scale=px_scales, batch=batch_ids)
+            for k, px_scale in enumerate(np.split(px_scales_batch, split_points)):
+                px_scales[k].append(px_scale)
+                batch_ids[k].append([batch_idx] * px_scale.shape[0])
+
+        outputs = []
+        for px_scales_sel, batch_ids_sel in zip(px_scales, batch_ids):
+            px_scales_sel = np.concatenate(px_scales_sel)
+            batch_ids_sel = np.concatenate(batch_ids_sel).reshape(-1)
+            if px_scales_sel.shape[0] != batch_ids_sel.shape[0]:
+                raise ValueError("sampled scales and batches have inconsistent shapes")
+            if give_mean:
+                px_scales_sel = px_scales_sel.mean(0)
+            outputs.append(dict(scale=px_scales_sel, batch=batch_ids_sel))
+        return outputs
 
 
 def estimate_delta(lfc_means: List[np.ndarray], coef=0.6, min_thres=0.3):
@@ -0,0 +1,23 @@
+import torch
+
+from scvi.nn import FCLayers
+
+
+def test_fclayers_eval_3d_batch_norm():
+    torch.manual_seed(0)
+    layers = FCLayers(n_in=5, n_out=8, n_cat_list=[3], n_layers=2)
+    # non-default running statistics
+    layers.train()
+    layers(torch.randn(64, 5), torch.randint(3, (64, 1)))
+    layers.eval()
+
+    # expanded and permuted samples are not contiguous
+    x = torch.randn(1, 10, 5).expand(4, 10, 5)
+    permuted = torch.randn(10, 4, 5).permute(1, 0, 2)
+    cat = torch.randint(3, (10, 1))
+    for inputs in (x, permuted):
+        assert not inputs.is_contiguous()
+        with torch.no_grad():
+            out = layers(inputs, cat)
+            expected = torch.stack([layers(slice_x, cat) for slice_x in inputs])
+        torch.testing.assert_close(out, expected)
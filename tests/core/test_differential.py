@@ -5,6 +5,7 @@ import pytest
 
 from scvi.data import synthetic_iid
 from scvi.model import SCVI
+from scvi.model._utils import scrna_raw_counts_properties
 from scvi.model.base._utils import _prepare_obs
 from scvi.utils import DifferentialComputation
 from scvi.utils._differential import estimate_delta, estimate_pseudocounts_offset
@@ -127,3 +128,51 @@ def test_differential_computation(save_path):
     a.obs["test"] = ["0"] * 200 + ["1"] * 200
     model = SCVI(a)
     model.differential_expression(groupby="test", group1="0")
+
+
+def test_scrna_raw_counts_properties():
+    adata = synthetic_iid()
+    idx1 = (adata.obs["labels"] == "label_0").to_numpy()
+    # the rest of the cells, as a mask and as indices
+    rest = scrna_raw_counts_properties(adata, idx1, ~idx1)
+    expected = scrna_raw_counts_properties(adata, idx1, np.flatnonzero(~idx1))
+    for key, value in expected.items():
+        np.testing.assert_allclose(rest[key], value, rtol=1e-5)
+    np.testing.assert_allclose(rest["raw_mean2"], adata.X[~idx1].mean(0), rtol=1e-5)
+
+
+def test_scale_sampler_joint_selections():
+    adata = synthetic_iid()
+    calls = []
+
+    def model_fn(adata, indices, transform_batch, n_samples_overall):
+        calls.append(n_samples_overall)
+        if n_samples_overall is not None:
+            indices = np.random.choice(indices, n_samples_overall)
+        # each row holds the index of the cell it was decoded from
+        return np.repeat(np.asarray(indices)[:, None], 3, axis=1).astype(float)
+
+    dc = DifferentialComputation(model_fn, adata)
+    idx1 = np.asarray(adata.obs.labels == "label_1")
+    idx2 = np.flatnonzero(adata.obs.labels == "label_2")[:10]
+    res1, res2 = dc._scale_sampler(selections=[idx1, idx2], n_samples=100)
+    # one call per batch, with the cells drawn by the sampler
+    assert calls == [None, None]
+    # 50 samples per batch, from the cells of the right selection
+    for res, selection in ((res1, np.flatnonzero(idx1)), (res2, idx2)):
+        assert res["scale"].shape == (100, 3)
+        assert np.isin(res["scale"][:, 0], selection).all()
+        np.testing.assert_array_equal(
+            res["batch"], np.repeat(["batch_0", "batch_1"], 50)
+        )
+
+    # a single selection keeps the model_fn subsampling contract
+    calls.clear()
+    res = dc.scale_sampler(selection=idx2, n_samples=100)
+    assert calls == [50, 50]
+    assert res["scale"].shape == (100, 3)
+    assert np.isin(res["scale"][:, 0], idx2).all()
+
+    with pytest.warns(UserWarning, match="n_samples_per_cell") as record:
+        dc._scale_sampler(selections=[idx1, idx2], n_samples=100, n_samples_per_cell=2)
+    assert len(record) == 1
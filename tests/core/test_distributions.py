@@ -5,6 +5,7 @@ import torch
 from scvi.distributions import NegativeBinomial, ZeroInflatedNegativeBinomial
 from scvi.distributions._negative_binomial import log_nb_positive, log_zinb_positive
 from scvi.model._metrics import unsupervised_clustering_accuracy
+from scvi.module._utils import kl_standard_normal, normal_log_prob
 
 use_gpu = True
 
@@ -70,3 +71,24 @@ def test_zinb_distribution():
         dist1.log_prob(-x)  # ensures neg values raise warning
     with pytest.warns(UserWarning):
         dist2.log_prob(0.5 * x)  # ensures float values raise warning
+
+
+def test_normal_log_prob():
+    torch.manual_seed(0)
+    x = torch.randn(3, 5, 10)
+    mean = torch.randn(5, 10)
+    var = torch.rand(5, 10) + 0.1
+    expected = torch.distributions.Normal(mean, var.sqrt()).log_prob(x).sum(-1)
+    assert torch.allclose(normal_log_prob(x, mean, var), expected, atol=1e-5)
+    expected = torch.distributions.Normal(0, 1).log_prob(x).sum(-1)
+    assert torch.allclose(normal_log_prob(x), expected, atol=1e-5)
+
+
+def test_kl_standard_normal():
+    torch.manual_seed(0)
+    mean = torch.randn(5, 10)
+    var = torch.rand(5, 10) + 0.1
+    expected = torch.distributions.kl_divergence(
+        torch.distributions.Normal(mean, var.sqrt()), torch.distributions.Normal(0, 1)
+    ).sum(-1)
+    assert torch.allclose(kl_standard_normal(mean, var), expected, atol=1e-5)
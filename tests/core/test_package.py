@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import pytest
+
+import scvi
+
+
+@pytest.mark.parametrize(
+    "attr",
+    [
+        "data.synthetic_iid",
+        "dataloaders.AnnDataLoader",
+        "distributions.ZeroInflatedNegativeBinomial",
+        "external.GIMVI",
+        "model.SCVI",
+        "module.VAE",
+        "nn.FCLayers",
+        "train.TrainingPlan",
+        "utils.DifferentialComputation",
+    ],
+)
+def test_lazy_submodules(attr):
+    # a fresh interpreter, as other tests have already imported the subpackages
+    code = "import scvi; scvi.{}".format(attr)
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_dir_lists_submodules():
+    assert set(scvi._LAZY_SUBMODULES) <= set(dir(scvi))
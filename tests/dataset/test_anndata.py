@@ -18,6 +18,11 @@ from scvi.data import (
     view_anndata_setup,
 )
 from scvi.data._anndata import get_from_registry
+from scvi.data._utils import (
+    _check_nonnegative_integers,
+    _compute_library_size,
+    _get_batch_codes,
+)
 from scvi.dataloaders import AnnTorchDataset
 
 
@@ -219,6 +224,76 @@ def test_setup_anndata():
     )
 
 
+def test_library_size_batch():
+    adata = synthetic_iid(run_setup_anndata=False)
+    adata.X[0] = 0
+    with pytest.warns(UserWarning):
+        setup_anndata(adata, batch_key="batch")
+    sum_counts = adata.X.sum(axis=1)
+    log_counts = np.log(np.where(sum_counts > 0, sum_counts, 1))
+    for b in np.unique(adata.obs["batch"]):
+        idx = (adata.obs["batch"] == b).values
+        np.testing.assert_allclose(
+            adata.obs["_scvi_local_l_mean"][idx], np.mean(log_counts[idx]), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            adata.obs["_scvi_local_l_var"][idx], np.var(log_counts[idx]), rtol=1e-4
+        )
+
+    # sparse data should give the same prior
+    adata_sparse = adata.copy()
+    adata_sparse.X = sparse.csr_matrix(adata.X)
+    with pytest.warns(UserWarning):
+        setup_anndata(adata_sparse, batch_key="batch")
+    np.testing.assert_allclose(
+        adata.obs["_scvi_local_l_mean"], adata_sparse.obs["_scvi_local_l_mean"]
+    )
+
+
+def test_library_size():
+    adata = synthetic_iid(run_setup_anndata=False)
+    log_counts = np.log(adata.X.sum(axis=1))
+    for data in [adata.X, sparse.csr_matrix(adata.X)]:
+        local_mean, local_var = _compute_library_size(data)
+        assert local_mean.shape == local_var.shape == (1, 1)
+        np.testing.assert_allclose(local_mean, np.mean(log_counts), rtol=1e-5)
+        np.testing.assert_allclose(local_var, np.var(log_counts), rtol=1e-4)
+
+
+def test_check_nonnegative_integers():
+    adata = synthetic_iid(run_setup_anndata=False)
+    assert _check_nonnegative_integers(adata.X) is True
+    assert _check_nonnegative_integers(sparse.csr_matrix(adata.X)) is True
+    assert _check_nonnegative_integers(pd.DataFrame(adata.X)) is True
+    assert _check_nonnegative_integers(adata.X.astype(np.int64)) is True
+    assert _check_nonnegative_integers(adata.X + 0.5) is False
+    assert _check_nonnegative_integers(-np.ones((5, 5), dtype=np.int64)) is False
+    assert _check_nonnegative_integers(sparse.csr_matrix((5, 5))) is True
+    # the global random state is not consumed by the check
+    np.random.seed(0)
+    expected = np.random.rand()
+    np.random.seed(0)
+    _check_nonnegative_integers(adata.X)
+    assert np.random.rand() == expected
+
+
+def test_get_batch_codes():
+    for batches in [
+        np.array([2, 0, 2, 5]),
+        pd.Series(["b", "a", "b"]).astype("category"),
+        pd.Series(["x", "y", "x"]),
+    ]:
+        for registered in [False, True]:
+            names, codes = _get_batch_codes(batches, registered=registered)
+            unique, inverse = np.unique(np.asarray(batches), return_inverse=True)
+            np.testing.assert_array_equal(names, unique)
+            np.testing.assert_array_equal(codes, inverse)
+    # sparse user ids are not counted with a dense bincount
+    names, codes = _get_batch_codes(np.array([10 ** 12, 3, 10 ** 12]))
+    np.testing.assert_array_equal(names, [3, 10 ** 12])
+    np.testing.assert_array_equal(codes, [1, 0, 1])
+
+
 def test_save_setup_anndata(save_path):
     adata = synthetic_iid()
     adata.write(os.path.join(save_path, "test.h5ad"))
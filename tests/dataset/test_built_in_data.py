@@ -1,8 +1,14 @@
-from unittest import TestCase
+import errno
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
 
+import numpy as np
 import pytest
 
 import scvi
+from scvi.data._built_in_data._cortex import _cortex_cache_key
 
 from .utils import unsupervised_training_one_epoch
 
@@ -69,6 +75,48 @@ class TestCortexDataset(TestCase):
         scvi.data.setup_anndata(adata, labels_key="cell_type")
         unsupervised_training_one_epoch(adata)
 
+    def test_cache(self):
+        adata = scvi.data.cortex(save_path="tests/data", run_setup_anndata=False)
+        assert os.path.exists("tests/data/expression.cache.npz")
+        adata_cached = scvi.data.cortex(save_path="tests/data", run_setup_anndata=False)
+        np.testing.assert_array_equal(adata.X.toarray(), adata_cached.X.toarray())
+        np.testing.assert_array_equal(adata.var_names, adata_cached.var_names)
+        np.testing.assert_array_equal(
+            adata.obs["cell_type"], adata_cached.obs["cell_type"]
+        )
+
+    def test_cache_stale_key(self):
+        with tempfile.TemporaryDirectory() as save_path:
+            raw_path = os.path.join(save_path, "expression.bin")
+            cache_path = os.path.join(save_path, "expression.cache.npz")
+            shutil.copy("tests/data/expression.bin", raw_path)
+            adata = scvi.data.cortex(save_path=save_path, run_setup_anndata=False)
+            # tamper with the cached counts, then change the raw file
+            with np.load(cache_path) as cache:
+                stale = dict(cache)
+            stale["data"] = stale["data"] * 2
+            np.savez(cache_path, **stale)
+            with open(raw_path, "a") as f:
+                f.write("\n")
+            adata_reparsed = scvi.data.cortex(
+                save_path=save_path, run_setup_anndata=False
+            )
+            np.testing.assert_array_equal(adata.X.toarray(), adata_reparsed.X.toarray())
+            with np.load(cache_path) as cache:
+                assert str(cache["key"]) == _cortex_cache_key(raw_path)
+                assert str(cache["key"]) != str(stale["key"])
+
+    def test_cache_unwritable(self):
+        with tempfile.TemporaryDirectory() as save_path:
+            shutil.copy("tests/data/expression.bin", save_path)
+            error = PermissionError(errno.EACCES, "Read-only file system")
+            with mock.patch.object(np, "savez", side_effect=error):
+                adata = scvi.data.cortex(save_path=save_path, run_setup_anndata=False)
+            # no cache, and no partially written file either
+            assert os.listdir(save_path) == ["expression.bin"]
+        expected = scvi.data.cortex(save_path="tests/data", run_setup_anndata=False)
+        np.testing.assert_array_equal(adata.X.toarray(), expected.X.toarray())
+
 
 class TestBrainLargeDataset(TestCase):
     def test_populate(self):
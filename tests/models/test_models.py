@@ -1,15 +1,20 @@
 import os
 import tarfile
+import warnings
 
 import anndata
 import numpy as np
 import pandas as pd
 import pytest
+import torch
 from pytorch_lightning.callbacks import LearningRateMonitor
 from scipy.sparse import csr_matrix
+from torch.distributions import Normal
+from torch.distributions import kl_divergence as kl
 from torch.nn import Softplus
 
 import scvi
+from scvi import _CONSTANTS
 from scvi.data import setup_anndata, synthetic_iid, transfer_anndata_setup
 from scvi.data._built_in_data._download import _download
 from scvi.dataloaders import (
@@ -29,6 +34,7 @@ from scvi.model import (
     DestVI,
     LinearSCVI,
 )
+from scvi.module import TOTALVAE
 from scvi.train import TrainingPlan, TrainRunner
 
 
@@ -202,6 +208,58 @@ def test_scvi_sparse(save_path):
     model.differential_expression(groupby="labels", group1="label_1")
 
 
+def test_scvi_normalized_expression_use_amp():
+    adata = synthetic_iid()
+    model = SCVI(adata, n_latent=5)
+    kwargs = dict(n_samples=3, transform_batch=["batch_0", "batch_1"])
+    torch.manual_seed(0)
+    expected = model.get_normalized_expression(**kwargs)
+    torch.manual_seed(0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        amp = model.get_normalized_expression(use_amp=True, **kwargs)
+    if model.device.type == "cuda":
+        np.testing.assert_allclose(amp.values, expected.values, rtol=1e-2)
+    else:
+        # autocast only applies on a GPU
+        pd.testing.assert_frame_equal(amp, expected)
+
+
+@pytest.mark.parametrize("use_observed_lib_size", [True, False])
+def test_scvi_marginal_ll_blocks(use_observed_lib_size):
+    adata = synthetic_iid()
+    model = SCVI(adata, use_observed_lib_size=use_observed_lib_size)
+    model.module.eval()
+    tensors = next(iter(model._make_data_loader(adata=adata, batch_size=128)))
+
+    def marginal_ll(n_mc_samples, **kwargs):
+        torch.manual_seed(0)
+        with torch.no_grad():
+            return model.module.marginal_ll(tensors, n_mc_samples, **kwargs)
+
+    # a single block, however large, draws the same samples
+    assert marginal_ll(30, n_mc_samples_per_pass=30) == marginal_ll(
+        30, n_mc_samples_per_pass=1000
+    )
+    # blocks of one sample each, and a last block shorter than the default 25
+    single = marginal_ll(30, n_mc_samples_per_pass=1)
+    blocked = marginal_ll(30)
+    rtol = 1e-3 if use_observed_lib_size else 5e-2
+    np.testing.assert_allclose(single, blocked, rtol=rtol)
+
+    # the block size can be set from the model API
+    def get_marginal_ll(**kwargs):
+        torch.manual_seed(0)
+        return model.get_marginal_ll(n_mc_samples=30, **kwargs)
+
+    assert get_marginal_ll(n_mc_samples_per_pass=30) == get_marginal_ll(
+        n_mc_samples_per_pass=1000
+    )
+    np.testing.assert_allclose(
+        get_marginal_ll(n_mc_samples_per_pass=1), get_marginal_ll(), rtol=rtol
+    )
+
+
 def test_saving_and_loading(save_path):
     def test_save_load_model(cls, adata, save_path):
         model = cls(adata, latent_distribution="normal")
@@ -542,6 +600,24 @@ def test_autozi():
         autozivae.get_alphas_betas()
 
 
+def test_autozi_marginal_ll_blocks():
+    adata = synthetic_iid()
+    model = AUTOZI(adata)
+
+    def marginal_ll(**kwargs):
+        torch.manual_seed(0)
+        return model.get_marginal_ll(n_mc_samples=30, **kwargs)
+
+    # a single pass, however large, draws the same samples
+    assert marginal_ll(n_mc_samples_per_pass=30) == marginal_ll(
+        n_mc_samples_per_pass=1000
+    )
+    # 30 is not a multiple of the default 25, so the last pass is shorter
+    blocked = marginal_ll()
+    assert np.isfinite(blocked)
+    np.testing.assert_allclose(marginal_ll(n_mc_samples_per_pass=1), blocked, rtol=1e-2)
+
+
 def test_totalvi(save_path):
     adata = synthetic_iid()
     n_obs = adata.n_obs
@@ -653,6 +729,47 @@ def test_totalvi(save_path):
     model.train(1, train_size=0.5)
 
 
+def test_totalvi_protein_batch_masks():
+    adata = synthetic_iid(run_setup_anndata=False)
+    setup_anndata(
+        adata,
+        batch_key="batch",
+        protein_expression_obsm_key="protein_expression",
+    )
+    n_proteins = adata.obsm["protein_expression"].shape[1]
+    mask = np.arange(n_proteins) >= 10
+    # batch 1 has no entry, so all its proteins count
+    module = TOTALVAE(adata.n_vars, n_proteins, n_batch=2, protein_batch_mask={0: mask})
+    module.eval()
+    model = TOTALVI(adata)
+    tensors = next(iter(model._make_data_loader(adata=adata, batch_size=adata.n_obs)))
+    with torch.no_grad():
+        _, generative_outputs, losses = module(tensors)
+
+    # previous masking, built per minibatch from the dict
+    batch_index = tensors[_CONSTANTS.BATCH_KEY].reshape(-1)
+    y = tensors[_CONSTANTS.PROTEIN_EXP_KEY]
+    expected_mask = torch.ones_like(y)
+    expected_mask[batch_index == 0] = torch.tensor(mask.astype(np.float32))
+    assert (batch_index == 1).any()
+    _, expected_reconst_loss = module.get_reconstruction_loss(
+        tensors[_CONSTANTS.X_KEY],
+        y,
+        generative_outputs["px_"],
+        generative_outputs["py_"],
+        expected_mask,
+    )
+    torch.testing.assert_close(
+        losses._reconstruction_loss["reconst_loss_protein"], expected_reconst_loss
+    )
+    # KL of the background mean, only over the observed proteins
+    py_ = generative_outputs["py_"]
+    kl_back = kl(Normal(py_["back_alpha"], py_["back_beta"]), module.back_mean_prior)
+    torch.testing.assert_close(
+        losses._kl_local["kl_div_back_pro"], (expected_mask * kl_back).sum(dim=1)
+    )
+
+
 def test_multiple_covariates(save_path):
     adata = synthetic_iid()
     adata.obs["cont1"] = np.random.normal(size=(adata.shape[0],))